@@ -0,0 +1,155 @@
+"""Operational endpoints: metrics, profiles and bulk export/import."""
+import hmac
+import io
+import os
+
+import click
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy.exc import IntegrityError
+
+import data_transfer
+import migrations
+from extensions import db, job_queue, logger, metrics_registry, profiles, response_cache
+from helpers import role_required
+from messages import message_writer
+from models import Message, Project, Proposal, User
+from projects import queue_project_index_sync
+
+# No CLI group: the data commands stay top-level, e.g. "flask data-export"
+admin_bp = Blueprint('admin', __name__, cli_group=None)
+
+# Metrics and Profiling
+@admin_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    token = current_app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {token}"):
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    return Response(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@admin_bp.route('/api/admin/profiles', methods=['GET'])
+@role_required('admin')
+def get_profiles():
+    return jsonify(profiles.summaries()), 200
+
+@admin_bp.route('/api/admin/profiles/<int:profile_id>', methods=['GET'])
+@role_required('admin')
+def get_profile(profile_id):
+    report = profiles.get(profile_id)
+    if report is None:
+        return jsonify({'error': 'Profile not found or already discarded'}), 404
+    return jsonify(report), 200
+
+@admin_bp.route('/api/admin/metrics/message-writer', methods=['GET'])
+@role_required('admin')
+def get_message_writer_metrics():
+    return jsonify(message_writer.stats()), 200
+
+@admin_bp.route('/api/admin/metrics/jobs', methods=['GET'])
+@role_required('admin')
+def get_job_metrics():
+    return jsonify(job_queue.stats()), 200
+
+@admin_bp.route('/api/admin/metrics/cache', methods=['GET'])
+@role_required('admin')
+def get_cache_metrics():
+    return jsonify(response_cache.stats()), 200
+
+# Bulk Export and Import
+TRANSFER_TABLES = {
+    'users': User.__table__,
+    'projects': Project.__table__,
+    'proposals': Proposal.__table__,
+    'messages': Message.__table__,
+}
+# Password hashes never leave the database; imported users get an unusable
+# hash and must have their password reset before they can log in
+TRANSFER_EXCLUDED = {'users': {'password'}}
+IMPORT_DEFAULTS = {'users': {'password': '!'}}
+
+def _export_columns(name):
+    return [c.name for c in TRANSFER_TABLES[name].columns if c.name not in TRANSFER_EXCLUDED.get(name, ())]
+
+def _import_table(conn, name, stream, fmt, skip_existing=False):
+    records = data_transfer.read_records(stream, fmt)
+    count = data_transfer.import_records(conn, TRANSFER_TABLES[name], records,
+                                         defaults=IMPORT_DEFAULTS.get(name), skip_existing=skip_existing)
+    if name == 'messages':
+        migrations.rebuild_conversations(conn)
+    return count
+
+@admin_bp.route('/api/admin/export/<name>', methods=['GET'])
+@role_required('admin')
+def export_table(name):
+    if name not in TRANSFER_TABLES:
+        return jsonify({'error': f"Unknown table: {name}"}), 404
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in data_transfer.FORMATS:
+        return jsonify({'error': 'Format must be ndjson or csv'}), 400
+
+    def generate():
+        with db.engine.connect() as conn:
+            yield from data_transfer.export_lines(conn, TRANSFER_TABLES[name], _export_columns(name), fmt)
+
+    response = Response(stream_with_context(generate()), mimetype=data_transfer.FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{name}.{fmt}"'
+    return response
+
+@admin_bp.route('/api/admin/import/<name>', methods=['POST'])
+@role_required('admin')
+def import_table(name):
+    if name not in TRANSFER_TABLES:
+        return jsonify({'error': f"Unknown table: {name}"}), 404
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in data_transfer.FORMATS:
+        return jsonify({'error': 'Format must be ndjson or csv'}), 400
+
+    skip_existing = request.args.get('skip_existing', '').lower() in ('1', 'true')
+    try:
+        stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
+        with db.engine.begin() as conn:
+            count = _import_table(conn, name, stream, fmt, skip_existing)
+    except IntegrityError as e:
+        return jsonify({'error': f"Import rejected by the database: {e.orig}"}), 400
+    except (ValueError, KeyError) as e:
+        return jsonify({'error': f"Invalid {fmt} input: {e}"}), 400
+    except Exception as e:
+        logger.exception(f"Error importing {name}: {str(e)}")
+        return jsonify({'error': f"Failed to import {name}"}), 500
+
+    # Imported rows can belong to any project or client, so drop every cached view
+    response_cache.invalidate_all()
+    if name == 'projects':
+        # Imported ids can be below ones already indexed
+        queue_project_index_sync(force=True)
+    return jsonify({'table': name, 'imported': count}), 200
+
+@admin_bp.cli.command('data-export')
+@click.argument('directory')
+@click.option('--format', 'fmt', type=click.Choice(list(data_transfer.FORMATS)), default='ndjson')
+def data_export(directory, fmt):
+    """Export users, projects, proposals and messages to DIRECTORY, one file per table."""
+    os.makedirs(directory, exist_ok=True)
+    with db.engine.connect() as conn:
+        for name in TRANSFER_TABLES:
+            path = os.path.join(directory, f"{name}.{fmt}")
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(data_transfer.export_lines(conn, TRANSFER_TABLES[name], _export_columns(name), fmt))
+            print(f"Exported {name} to {path}")
+
+@admin_bp.cli.command('data-import')
+@click.argument('directory')
+@click.option('--format', 'fmt', type=click.Choice(list(data_transfer.FORMATS)), default='ndjson')
+@click.option('--skip-existing', is_flag=True, help='Leave out rows whose id already exists (e.g. the seeded admin).')
+def data_import(directory, fmt, skip_existing):
+    """Import the table files in DIRECTORY, parents first, in one transaction."""
+    names = {table: name for name, table in TRANSFER_TABLES.items()}
+    with db.engine.begin() as conn:
+        for table in data_transfer.dependency_order(TRANSFER_TABLES.values()):
+            path = os.path.join(directory, f"{names[table]}.{fmt}")
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8', newline='') as f:
+                count = _import_table(conn, names[table], f, fmt, skip_existing)
+            print(f"Imported {count} {names[table]} from {path}")
+    # Only reaches the running workers when they share a Redis cache
+    response_cache.invalidate_all()
@@ -1,567 +1,378 @@
-from flask import Flask, request, jsonify, make_response
-from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime, timedelta
-from flask_cors import CORS
+"""TalentLink API application factory.
+
+``create_app`` builds a configured app; importing this module does no
+database work and starts no threads. The schema and the admin account are
+set up once per database with ``flask --app app init-db`` (``python app.py``
+does it before starting the development server).
+"""
+from flask import Flask, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import generate_password_hash
+from sqlalchemy import event
+from datetime import timedelta
+from dotenv import load_dotenv
 import os
-from functools import wraps
-
-# Initialize Flask app
-app = Flask(__name__)
-
-# Configure CORS with more specific settings
-cors = CORS(
-    app,
-    resources={
-        r"/*": {
-            "origins": ["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:5173", "http://127.0.0.1:5173"],
-            "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"],
-            "supports_credentials": True,
-            "expose_headers": ["Content-Type", "Authorization"],
-            "vary_header": False
-        }
-    }
-)
-
-app.config['SECRET_KEY'] = 'your-secret-key-here'  # Change this in production
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///talentlink.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['JWT_SECRET_KEY'] = 'jwt-secret-key'  # Change this in production
-app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=1)
-
-# Request logging middleware
-@app.before_request
-def log_request():
-    print(f"{request.method} {request.path} - Headers: {dict(request.headers)}")
-    if request.method == 'OPTIONS':
-        # Handle preflight requests
-        return '', 200
-
-# Initialize extensions
-db = SQLAlchemy(app)
-jwt = JWTManager(app)
-
-# Database Models
-class User(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=True)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password = db.Column(db.String(255), nullable=False)
-    role = db.Column(db.String(20), nullable=False)  # 'client' or 'freelancer'
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    projects = db.relationship('Project', backref='owner', lazy=True)
-    proposals = db.relationship('Proposal', backref='freelancer', lazy=True)
-
-class Project(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(200), nullable=False)
-    description = db.Column(db.Text, nullable=False)
-    category = db.Column(db.String(100))
-    budget = db.Column(db.Float, nullable=False)
-    status = db.Column(db.String(20), default='open')  # open, in_progress, completed
-    deadline = db.Column(db.DateTime)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    client_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    proposals = db.relationship('Proposal', backref='project', lazy=True)
-
-class Proposal(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    cover_letter = db.Column(db.Text, nullable=False)
-    bid_amount = db.Column(db.Float, nullable=False)
-    status = db.Column(db.String(20), default='pending')  # pending, accepted, rejected
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    freelancer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
-
-class Message(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    content = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    receiver_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=True)
-
-# CORS Helper Functions
-def _build_cors_preflight_response():
-    response = make_response()
-    response.headers.add('Access-Control-Allow-Headers', "Content-Type,Authorization")
-    response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
-    response.headers.add('Access-Control-Allow-Credentials', 'true')
-    return response
-
-def _corsify_actual_response(response):
-    # Let Flask-CORS handle the CORS headers
-    return response
-
-# Helper Functions
-def role_required(role):
-    def decorator(f):
-        @wraps(f)
-        @jwt_required()
-        def decorated_function(*args, **kwargs):
-            current_user = get_jwt_identity()
-            user = User.query.get(current_user['id'])
-            if user.role != role:
-                return jsonify({'message': 'Unauthorized'}), 403
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
-
-# Authentication Routes
-@app.route('/api/auth/register', methods=['POST', 'OPTIONS'])
-def register():
-    print("\n=== Registration Request ===")
-    print(f"Method: {request.method}")
-    print(f"Headers: {dict(request.headers)}")
-    
-    if request.method == 'OPTIONS':
-        print("Handling OPTIONS request")
-        response = make_response()
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'POST')
-        return response
+import logging
+import time
+import config
+import migrations
+import atexit
+import structured_logging
+from compression import compress_response
+from serializers import json_provider
+from extensions import (cors, db, job_queue, jwt, logger, metrics_registry, password_hasher, profiles,
+                        project_index, rate_limiter, response_cache, socketio)
+from helpers import QueryBudgetExceeded
+from models import Conversation, User
+from auth import auth_bp, revoked_users
+from projects import projects_bp
+from proposals import proposals_bp
+from messages import message_writer, messages_bp
+from admin import admin_bp
 
-    try:
-        data = request.get_json()
-        print(f"Received data: {data}")
-        
-        if not data:
-            print("Error: No data provided")
-            return jsonify({'message': 'No data provided'}), 400
-            
-        if not data.get('email') or not data.get('password'):
-            print("Error: Email and password are required")
-            return jsonify({'message': 'Email and password are required'}), 400
-        
-        existing_user = User.query.filter_by(email=data['email']).first()
-        if existing_user:
-            print(f"Error: Email {data['email']} already registered")
-            return jsonify({'message': 'Email already registered'}), 400
-        
-        print(f"Creating user with email: {data['email']}")
-        hashed_password = generate_password_hash(data['password'], method='pbkdf2:sha256')
-        
-        user = User(
-            name=data.get('name', ''),
-            email=data['email'],
-            password=hashed_password,
-            role=data.get('role', 'freelancer')  # Default to freelancer if not specified
-        )
-        
-        db.session.add(user)
-        db.session.commit()
-        print(f"User created successfully with ID: {user.id}")
-        
-        try:
-            access_token = create_access_token(identity={
-                'id': user.id,
-                'email': user.email,
-                'role': user.role
-            })
-            print("Access token created successfully")
-            
-            response_data = {
-                'message': 'User registered successfully',
-                'access_token': access_token,
-                'user': {
-                    'id': user.id,
-                    'name': user.name,
-                    'email': user.email,
-                    'role': user.role
-                }
-            }
-            print(f"Sending response: {response_data}")
-            return jsonify(response_data), 201
-            
-        except Exception as token_error:
-            print(f"Error creating access token: {str(token_error)}")
-            db.session.rollback()
-            return jsonify({'message': 'Error creating access token'}), 500
-            
-    except Exception as e:
-        print(f"Registration error: {str(e)}")
-        db.session.rollback()
-        return jsonify({
-            'message': 'Registration failed',
-            'error': str(e),
-            'error_type': type(e).__name__
-        }), 500
-
-@app.route('/api/auth/login', methods=['POST'])
-def login():
-    data = request.get_json()
-    user = User.query.filter_by(email=data['email']).first()
-    
-    if not user or not check_password_hash(user.password, data['password']):
-        return jsonify({'message': 'Invalid credentials'}), 401
-    
-    access_token = create_access_token(identity={
-        'id': user.id,
-        'email': user.email,
-        'role': user.role
+load_dotenv()
+
+CORS_ORIGINS = ["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:5173", "http://127.0.0.1:5173"]
+
+ADMIN_EMAIL = 'admin@talentlink.com'
+
+def create_app(overrides=None):
+    """Build the app; overrides (a mapping) is applied on top of the environment config."""
+    app = Flask(__name__)
+    _load_config(app)
+    app.config.update(overrides or {})
+
+    if app.config['TRUSTED_PROXIES']:
+        # Rate limits are keyed by client IP, which is the proxy's without this
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'],
+                                x_proto=app.config['TRUSTED_PROXIES'])
+
+    log_handler = _configure_logging(app)
+    _init_extensions(app)
+    _register_request_hooks(app)
+
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(projects_bp)
+    app.register_blueprint(proposals_bp)
+    app.register_blueprint(messages_bp)
+    app.register_blueprint(admin_bp)
+    _register_commands(app)
+
+    metrics_registry.register_collector('log', lambda: {
+        'queue_depth': log_handler.queue.qsize(),
+        'dropped': log_handler.dropped
     })
-    
-    return jsonify({
-        'access_token': access_token,
-        'user': {
-            'id': user.id,
-            'name': user.name,
-            'email': user.email,
-            'role': user.role
+    metrics_registry.register_collector('response_cache', response_cache.stats)
+    metrics_registry.register_collector('rate_limit', rate_limiter.stats)
+    metrics_registry.register_collector('recommender', lambda: {'indexed_projects': len(project_index)})
+    metrics_registry.register_collector('jobs', job_queue.stats)
+    metrics_registry.register_collector('message_writer', message_writer.stats)
+
+    _register_shutdown()
+    return app
+
+_shutdown_registered = False
+
+def _register_shutdown():
+    # The services are shared by every app built in this process, so once is enough
+    global _shutdown_registered
+    if _shutdown_registered:
+        return
+    _shutdown_registered = True
+    # Stopped in reverse order: writers flush before logging shuts down
+    atexit.register(structured_logging.shutdown)
+    atexit.register(password_hasher.shutdown)
+    atexit.register(job_queue.close)
+    atexit.register(message_writer.close)
+
+def _load_config(app):
+    app.config['SECRET_KEY'] = 'your-secret-key-here'  # Change this in production
+    app.config['SQLALCHEMY_DATABASE_URI'] = config.database_url()
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = config.engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = 'jwt-secret-key'  # Change this in production
+    app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=1)
+    # Empty keeps token revocations in-process, or a redis:// URL shares them with every worker
+    app.config['REVOCATION_URL'] = os.environ.get('REVOCATION_URL', '')
+    # Fail requests that run more SQL statements than their declared budget (tests)
+    app.config['SQL_QUERY_BUDGET_ENFORCE'] = os.environ.get('SQL_QUERY_BUDGET_ENFORCE') == '1'
+    # Chat messages are group-committed: flush after this many or after this long
+    app.config['MESSAGE_BATCH_SIZE'] = int(os.environ.get('MESSAGE_BATCH_SIZE', 100))
+    app.config['MESSAGE_FLUSH_MS'] = float(os.environ.get('MESSAGE_FLUSH_MS', 5))
+    app.config['MESSAGE_ACK_TIMEOUT'] = float(os.environ.get('MESSAGE_ACK_TIMEOUT', 5))
+    # Empty picks eventlet when installed; the hasher and message writer block on OS
+    # locks, so eventlet needs a monkey-patching server such as gunicorn -k eventlet
+    app.config['SOCKETIO_ASYNC_MODE'] = os.environ.get('SOCKETIO_ASYNC_MODE') or None
+    # Empty disables the cache; a redis:// URL shares it with all workers, and
+    # "memory" keeps an in-process LRU that is only safe with a single worker
+    app.config['RESPONSE_CACHE_URL'] = os.environ.get('RESPONSE_CACHE_URL', '')
+    app.config['RESPONSE_CACHE_SIZE'] = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+    app.config['RESPONSE_CACHE_TTL'] = int(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'INFO')
+    app.config['LOG_QUEUE_SIZE'] = int(os.environ.get('LOG_QUEUE_SIZE', 10000))
+    # Fraction of successful requests logged per endpoint, e.g. "get_projects=0.1"
+    app.config['LOG_SAMPLE_RATES'] = os.environ.get('LOG_SAMPLE_RATES', '')
+    # Werkzeug method string including its cost, e.g. pbkdf2:sha256:600000 or scrypt:32768:8:1
+    app.config['PASSWORD_HASH_METHOD'] = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    app.config['PASSWORD_HASH_QUEUE'] = int(os.environ.get('PASSWORD_HASH_QUEUE', 32))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+    # Hashed feature dimension of the recommendation index (memory is ~4 bytes x dim per project)
+    app.config['RECOMMENDER_DIM'] = int(os.environ.get('RECOMMENDER_DIM', 256))
+    # Bearer token Prometheus must send to scrape /metrics; empty leaves it open
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN', '')
+    # Recent X-Profile captures kept for /api/admin/profiles
+    app.config['PROFILE_KEEP'] = int(os.environ.get('PROFILE_KEEP', 20))
+    # gzip (or brotli, if installed) JSON/text bodies at least this large; 0 disables
+    app.config['COMPRESS_MIN_BYTES'] = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+    app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 5))
+    app.config['RATE_LIMIT_ENABLED'] = os.environ.get('RATE_LIMIT_ENABLED', '1') == '1'
+    # Empty for in-process buckets, or a redis:// URL for limits shared by all workers
+    app.config['RATE_LIMIT_URL'] = os.environ.get('RATE_LIMIT_URL', '')
+    app.config['RATE_LIMIT_MAX_KEYS'] = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))
+    # Overrides of the default limits, e.g. "login.ip=60/minute,register.ip=off"
+    app.config['RATE_LIMITS'] = os.environ.get('RATE_LIMITS', '')
+    # Number of reverse proxies in front of the app whose X-Forwarded-For is trusted
+    app.config['TRUSTED_PROXIES'] = int(os.environ.get('TRUSTED_PROXIES', 0))
+    # Background jobs (notifications) run on in-process worker threads
+    app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+    app.config['JOB_MAX_ATTEMPTS'] = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+    app.config['JOB_QUEUE_SIZE'] = int(os.environ.get('JOB_QUEUE_SIZE', 10000))
+    # Notification emails are only sent when an SMTP host is configured
+    app.config['SMTP_HOST'] = os.environ.get('SMTP_HOST', '')
+    app.config['SMTP_PORT'] = int(os.environ.get('SMTP_PORT', 25))
+    app.config['SMTP_FROM'] = os.environ.get('SMTP_FROM', 'TalentLink <no-reply@talentlink.local>')
+
+def _configure_logging(app):
+    # Replaces the listener of any app built earlier in this process
+    _, log_handler, _ = structured_logging.configure(
+        level=app.config['LOG_LEVEL'],
+        queue_size=app.config['LOG_QUEUE_SIZE']
+    )
+    return log_handler
+
+def _init_extensions(app):
+    """Bind the shared extensions and services to this app.
+
+    Creating the engine doesn't connect; the first connection is made by the
+    first request or CLI command that needs one.
+    """
+    app.json = json_provider(app)
+    cors.init_app(
+        app,
+        resources={
+            r"/*": {
+                "origins": CORS_ORIGINS,
+                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+                "allow_headers": ["Content-Type", "Authorization"],
+                "supports_credentials": True,
+                "expose_headers": ["Content-Type", "Authorization"],
+                "vary_header": False
+            }
         }
-    }), 200
+    )
+    db.init_app(app)
+    jwt.init_app(app)
+    socketio.init_app(app, cors_allowed_origins=CORS_ORIGINS, async_mode=app.config['SOCKETIO_ASYNC_MODE'])
 
-# Project Routes
-@app.route('/api/projects', methods=['GET'])
-@jwt_required()
-def get_projects():
-    try:
-        projects = Project.query.all()
-        return jsonify([{
-            'id': p.id,
-            'title': p.title,
-            'description': p.description,
-            'category': p.category,
-            'budget': p.budget,
-            'status': p.status,
-            'deadline': p.deadline.isoformat() if p.deadline else None,
-            'created_at': p.created_at.isoformat(),
-            'client_id': p.client_id
-        } for p in projects])
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
-@app.route('/api/projects/my-projects', methods=['GET'])
-@jwt_required()
-@role_required('client')
-def get_my_projects():
-    try:
-        current_user = get_jwt_identity()
-        projects = Project.query.filter_by(client_id=current_user['id']).all()
-        return jsonify([{
-            'id': p.id,
-            'title': p.title,
-            'description': p.description,
-            'category': p.category,
-            'budget': p.budget,
-            'status': p.status,
-            'deadline': p.deadline.isoformat() if p.deadline else None,
-            'created_at': p.created_at.isoformat()
-        } for p in projects])
-    except Exception as e:
-        print(f"Error fetching projects: {str(e)}")
-        return jsonify({'error': 'Failed to fetch projects'}), 500
-
-@app.route('/api/projects', methods=['POST', 'OPTIONS'])
-@jwt_required()
-@role_required('client')
-def create_project():
-    if request.method == 'OPTIONS':
-        return _build_cors_preflight_response()
-        
+    password_hasher.configure(
+        method=app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        queue_size=app.config['PASSWORD_HASH_QUEUE'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT']
+    )
+    response_cache.configure(
+        app.config['RESPONSE_CACHE_URL'],
+        app.config['RESPONSE_CACHE_SIZE'],
+        app.config['RESPONSE_CACHE_TTL']
+    )
+    rate_limiter.configure(
+        app.config['RATE_LIMIT_URL'],
+        app.config['RATE_LIMIT_MAX_KEYS'],
+        app.config['RATE_LIMITS']
+    )
+    rate_limiter.enabled = app.config['RATE_LIMIT_ENABLED']
+    project_index.configure(dim=app.config['RECOMMENDER_DIM'])
+    profiles.keep = app.config['PROFILE_KEEP']
+    revoked_users.configure(app.config['REVOCATION_URL'], app.config['JWT_ACCESS_TOKEN_EXPIRES'].total_seconds())
+    job_queue.configure(
+        workers=app.config['JOB_WORKERS'],
+        max_attempts=app.config['JOB_MAX_ATTEMPTS'],
+        max_size=app.config['JOB_QUEUE_SIZE'],
+        context=app.app_context
+    )
+    message_writer.configure(
+        batch_size=app.config['MESSAGE_BATCH_SIZE'],
+        max_latency=app.config['MESSAGE_FLUSH_MS'] / 1000,
+        context=app.app_context
+    )
+
+    with app.app_context():
+        config.configure_engine(db.engine)
+        logger.info(config.engine_report(db.engine))
+        event.listen(db.engine, 'before_cursor_execute', _count_query)
+        event.listen(db.engine, 'after_cursor_execute', _time_query)
+
+# Query Budget Instrumentation
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+    if has_request_context():
+        g.sql_query_count = g.get('sql_query_count', 0) + 1
+
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'query_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    in_request = has_request_context()
+    if in_request:
+        g.sql_time = g.get('sql_time', 0.0) + elapsed
+    metrics_registry.observe_statement(elapsed, in_request)
+
+def _log_user_id():
     try:
-        current_user = get_jwt_identity()
-        data = request.get_json()
-        
-        # Log the received data for debugging
-        print("Received project data:", data)
-        
-        # Convert budget to float, handling different formats
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # No token was verified for this request
+        return None
+    return identity.get('id') if isinstance(identity, dict) else None
+
+def _register_request_hooks(app):
+    log_sampler = structured_logging.Sampler.parse(app.config['LOG_SAMPLE_RATES'])
+
+    # Response compression
+    # Registered before the other after_request hooks so it runs last, once
+    # logging and metrics have seen the uncompressed response
+    @app.after_request
+    def compress(response):
+        if app.config['COMPRESS_MIN_BYTES'] > 0:
+            compress_response(response, request.accept_encodings,
+                              min_size=app.config['COMPRESS_MIN_BYTES'], level=app.config['COMPRESS_LEVEL'])
+        return response
+
+    # Request logging middleware
+    @app.before_request
+    def log_request():
+        g.request_started = time.perf_counter()
+        if request.method == 'OPTIONS':
+            # Handle preflight requests
+            return '', 200
+
+    @app.after_request
+    def log_request_line(response):
+        # Errors are always logged; successful requests are sampled per endpoint
+        if response.status_code < 500 and not log_sampler.should_log(request.endpoint):
+            return response
+
+        started = g.get('request_started')
+        level = logging.ERROR if response.status_code >= 500 else logging.INFO
+        logger.log(level, 'request', extra={'fields': {
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3) if started else None,
+            'db_queries': g.get('sql_query_count', 0),
+            'db_ms': round(g.get('sql_time', 0.0) * 1000, 3),
+            'user_id': _log_user_id()
+        }})
+        return response
+
+    @app.after_request
+    def check_query_budget(response):
+        view = app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        count = g.get('sql_query_count', 0)
+        response.headers['X-SQL-Query-Count'] = str(count)
+        if budget is not None and count > budget:
+            message = f"{request.endpoint} ran {count} SQL statements (budget {budget})"
+            if app.config['SQL_QUERY_BUDGET_ENFORCE']:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    # Metrics and Profiling
+    @app.before_request
+    def start_profile():
+        # Admins can ask for a cProfile report of a single request with X-Profile: 1
+        if not request.headers.get('X-Profile'):
+            return
         try:
-            if isinstance(data['budget'], str):
-                budget = float(data['budget'].replace('$', '').replace(',', '').strip())
-            else:
-                budget = float(data['budget'])
-        except (ValueError, KeyError) as e:
-            return jsonify({'error': 'Invalid budget format'}), 400
-        
-        # Handle deadline if provided
-        deadline = None
-        if data.get('deadline'):
-            try:
-                deadline = datetime.strptime(data['deadline'], '%Y-%m-%d')
-            except ValueError:
-                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
-        
-        # Create and save the project
-        project = Project(
-            title=data.get('title', ''),
-            description=data.get('description', ''),
-            category=data.get('category'),
-            budget=budget,
-            status='open',
-            client_id=current_user['id'],
-            deadline=deadline
-        )
-        
-        db.session.add(project)
-        db.session.commit()
-        
-        response = jsonify({
-            'message': 'Project created successfully', 
-            'project_id': project.id,
-            'project': {
-                'id': project.id,
-                'title': project.title,
-                'status': project.status,
-                'created_at': project.created_at.isoformat()
-            }
-        })
-        
-        return _corsify_actual_response(response), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error creating project: {str(e)}")
-        return _corsify_actual_response(jsonify({'error': str(e)})), 500
-
-# Proposal Routes
-@app.route('/api/proposals', methods=['POST'])
-@jwt_required()
-@role_required('freelancer')
-def create_proposal():
-    try:
-        current_user = get_jwt_identity()
-        data = request.get_json()
-        
-        # Check if already applied
-        existing = Proposal.query.filter_by(
-            freelancer_id=current_user['id'],
-            project_id=data['project_id']
-        ).first()
-        
-        if existing:
-            return jsonify({'error': 'You have already submitted a proposal for this project'}), 400
-            
-        proposal = Proposal(
-            cover_letter=data['cover_letter'],
-            bid_amount=data['bid_amount'],
-            freelancer_id=current_user['id'],
-            project_id=data['project_id']
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            return
+        if identity and identity.get('role') == 'admin':
+            g.profiler = profiles.start()
+            g.profile_requested = True
+
+    @app.after_request
+    def record_metrics(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profile_id = profiles.finish(
+                profiler,
+                method=request.method,
+                path=request.full_path,
+                endpoint=request.endpoint,
+                status=response.status_code,
+                db_queries=g.get('sql_query_count', 0)
+            )
+            response.headers['X-Profile-Id'] = str(profile_id)
+        elif g.get('profile_requested'):
+            response.headers['X-Profile-Id'] = 'busy'
+
+        metrics_registry.observe_request(
+            request.endpoint,
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            None if response.is_streamed else response.calculate_content_length(),
+            g.get('sql_query_count', 0),
+            g.get('sql_time', 0.0)
         )
-        
-        db.session.add(proposal)
-        db.session.commit()
-        
-        return jsonify({
-            'message': 'Proposal submitted successfully',
-            'proposal_id': proposal.id
-        }), 201
-        
-    except Exception as e:
-        db.session.rollback()
-        return jsonify({'error': str(e)}), 400
-
-@app.route('/api/projects/available', methods=['GET'])
-@jwt_required()
-@role_required('freelancer')
-def get_available_projects():
-    try:
-        # Get projects that are open and not created by the current user
-        current_user = get_jwt_identity()
-        
-        projects = Project.query.filter(
-            Project.status == 'open',
-            Project.client_id != current_user['id'],
-            ~Project.proposals.any(Proposal.freelancer_id == current_user['id'])
-        ).all()
-        
-        return jsonify([{
-            'id': p.id,
-            'title': p.title,
-            'description': p.description,
-            'budget': p.budget,
-            'deadline': p.deadline.isoformat() if p.deadline else None,
-            'category': p.category,
-            'status': p.status,
-            'client_name': p.owner.name
-        } for p in projects])
-        
-    except Exception as e:
-        print(f"Error fetching available projects: {str(e)}")
-        return jsonify({'error': 'Failed to fetch available projects'}), 500
-
-@app.route('/api/proposals/accepted', methods=['GET'])
-@jwt_required()
-@role_required('freelancer')
-def get_accepted_proposals():
-    try:
-        current_user = get_jwt_identity()
-        
-        # Get all proposals for the current freelancer
-        proposals = Proposal.query.filter_by(
-            freelancer_id=current_user['id']
-        ).join(Project).add_entity(Project).all()
-        
-        result = []
-        for proposal, project in proposals:
-            result.append({
-                'id': proposal.id,
-                'project_id': project.id,
-                'project_title': project.title,
-                'project_description': project.description,
-                'proposal_status': proposal.status,  # Changed from project.status to proposal.status
-                'project_status': project.status,    # Keep project status as well
-                'bid_amount': proposal.bid_amount,
-                'cover_letter': proposal.cover_letter,
-                'client_name': project.owner.name,
-                'client_id': project.owner.id,       # Added client_id for messaging
-                'created_at': proposal.created_at.isoformat(),
-                'deadline': project.deadline.isoformat() if project.deadline else None
-            })
-            
-        return jsonify(result)
-        
-    except Exception as e:
-        print(f"Error fetching accepted proposals: {str(e)}")
-        return jsonify({'error': 'Failed to fetch accepted proposals'}), 500
-
-# Project Detail Routes
-@app.route('/api/projects/<int:project_id>', methods=['GET'])
-@jwt_required()
-def get_project(project_id):
-    try:
-        current_user = get_jwt_identity()
-        project = Project.query.get_or_404(project_id)
-        
-        # Check if current user is the owner or has a proposal
-        if project.client_id != current_user['id']:
-            # Check if user has a proposal for this project
-            proposal = Proposal.query.filter_by(
-                project_id=project_id,
-                freelancer_id=current_user['id']
-            ).first()
-            
-            if not proposal and current_user['role'] != 'admin':
-                return jsonify({'error': 'Not authorized to view this project'}), 403
-        
-        return jsonify({
-            'id': project.id,
-            'title': project.title,
-            'description': project.description,
-            'category': project.category,
-            'budget': project.budget,
-            'status': project.status,
-            'deadline': project.deadline.isoformat() if project.deadline else None,
-            'client_id': project.client_id,
-            'client_name': project.owner.name,
-            'created_at': project.created_at.isoformat()
-        }), 200
-        
-    except Exception as e:
-        print(f"Error fetching project: {str(e)}")
-        return jsonify({'error': 'Failed to fetch project details'}), 500
-
-@app.route('/api/projects/<int:project_id>/proposals', methods=['GET'])
-@jwt_required()
-def get_project_proposals(project_id):
-    try:
-        current_user = get_jwt_identity()
-        project = Project.query.get_or_404(project_id)
-        
-        # Only project owner can view proposals
-        if project.client_id != current_user['id'] and current_user['role'] != 'admin':
-            return jsonify({'error': 'Not authorized to view these proposals'}), 403
-        
-        proposals = Proposal.query.filter_by(project_id=project_id).all()
-        
-        result = []
-        for proposal in proposals:
-            freelancer = User.query.get(proposal.freelancer_id)
-            result.append({
-                'id': proposal.id,
-                'freelancer_id': freelancer.id,
-                'freelancer_name': freelancer.name,
-                'freelancer_email': freelancer.email,
-                'cover_letter': proposal.cover_letter,
-                'bid_amount': proposal.bid_amount,
-                'status': proposal.status,
-                'created_at': proposal.created_at.isoformat()
-            })
-            
-        return jsonify(result), 200
-        
-    except Exception as e:
-        print(f"Error fetching project proposals: {str(e)}")
-        return jsonify({'error': 'Failed to fetch project proposals'}), 500
-
-@app.route('/api/proposals/<int:proposal_id>', methods=['PUT'])
-@jwt_required()
-def update_proposal(proposal_id):
-    try:
-        current_user = get_jwt_identity()
-        data = request.get_json()
-        
-        if 'status' not in data or data['status'] not in ['accepted', 'rejected']:
-            return jsonify({'error': 'Invalid status. Must be "accepted" or "rejected"'}), 400
-            
-        proposal = Proposal.query.get_or_404(proposal_id)
-        project = Project.query.get_or_404(proposal.project_id)
-        
-        # Only project owner can update proposal status
-        if project.client_id != current_user['id'] and current_user['role'] != 'admin':
-            return jsonify({'error': 'Not authorized to update this proposal'}), 403
-            
-        # If accepting a proposal, reject all other proposals for this project
-        if data['status'] == 'accepted':
-            # Check if project is still open
-            if project.status != 'open':
-                return jsonify({'error': 'This project is no longer open for accepting proposals'}), 400
-                
-            # Reject all other proposals for this project
-            Proposal.query.filter(
-                Proposal.project_id == project.id,
-                Proposal.id != proposal_id
-            ).update({'status': 'rejected'}, synchronize_session=False)
-            
-            # Update project status to 'in_progress' and set the freelancer
-            project.status = 'in_progress'
-            project.freelancer_id = proposal.freelancer_id
-        
-        # Update the proposal status
-        proposal.status = data['status']
-        
-        db.session.commit()
-        
-        return jsonify({
-            'message': f'Proposal {data["status"]} successfully',
-            'project_status': project.status
-        }), 200
-        
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error updating proposal: {str(e)}")
-        return jsonify({'error': 'Failed to update proposal'}), 500
-
-# User Routes
-@app.route('/api/auth/me', methods=['GET'])
-@jwt_required()
-def get_current_user():
-    current_user = get_jwt_identity()
-    user = User.query.get(current_user['id'])
-    
-    return jsonify({
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'role': user.role
-    }), 200
+        return response
 
 # Initialize Database
-with app.app_context():
-    db.create_all()
-    
-    # Create admin user if not exists
-    if not User.query.filter_by(email='admin@talentlink.com').first():
+def init_db():
+    """Apply pending migrations and create the admin account; needs an app context."""
+    migrations.upgrade(db.engine, log=logger.info)
+
+    if not User.query.filter_by(email=ADMIN_EMAIL).first():
         admin = User(
-            email='admin@talentlink.com',
-            password=generate_password_hash('admin123', method='pbkdf2:sha256'),
+            email=ADMIN_EMAIL,
+            password=generate_password_hash('admin123', method=password_hasher.method),
             role='admin'
         )
         db.session.add(admin)
         db.session.commit()
 
+def _register_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create or upgrade the schema and seed the admin account (run once per deploy)."""
+        init_db()
+
+    @app.cli.command('db-upgrade')
+    def db_upgrade():
+        """Apply pending schema migrations."""
+        migrations.upgrade(db.engine)
+
+    @app.cli.command('rebuild-conversations')
+    def rebuild_conversations():
+        """Regenerate conversation summaries from the message history."""
+        with db.engine.begin() as conn:
+            migrations.rebuild_conversations(conn)
+        print(f"Rebuilt {Conversation.query.count()} conversations")
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    # Nothing has monkey-patched the stdlib here, so serve on real threads
+    app = create_app({'SOCKETIO_ASYNC_MODE': 'threading'})
+    with app.app_context():
+        init_db()
+    socketio.run(app, debug=True, port=5000, allow_unsafe_werkzeug=True)
@@ -0,0 +1,198 @@
+"""Registration, login and token revocation."""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Blueprint, jsonify, make_response, request
+from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from sqlalchemy import event
+
+from extensions import db, jwt, logger, password_hasher, rate_limiter
+from helpers import server_busy
+from models import User
+from password_hashing import HashingOverloaded
+from serializers import USER
+
+auth_bp = Blueprint('auth', __name__)
+
+# Token Revocation
+class RevocationCache:
+    """User ids whose tokens were revoked, each kept for the lifetime of those tokens.
+
+    An entry only needs to live as long as the tokens it invalidates, so the
+    TTL matches JWT_ACCESS_TOKEN_EXPIRES. Entries are never dropped before
+    then: losing one would silently un-revoke its tokens. The in-process store
+    only sees revocations made by its own process; configure a Redis URL when
+    several workers serve the API.
+    """
+
+    def __init__(self, ttl, prefix='talentlink:revoked:'):
+        self.ttl = ttl
+        self.prefix = prefix
+        self._redis = None
+        # user_id -> revoked_at, oldest revocation first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, url, ttl):
+        """Pick the store for the app's settings; call before serving requests."""
+        self.ttl = ttl
+        with self._lock:
+            self._entries.clear()
+        if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError('REVOCATION_URL points at Redis but the redis package is not installed')
+            self._redis = redis.Redis.from_url(url)
+        else:
+            self._redis = None
+
+    def revoke(self, user_id):
+        now = time.time()
+        if self._redis is not None:
+            self._redis.set(f"{self.prefix}{user_id}", repr(now), ex=math.ceil(self.ttl))
+            return
+        with self._lock:
+            self._entries[user_id] = now
+            self._entries.move_to_end(user_id)
+            # Expired entries are all at the front
+            while self._entries and now - next(iter(self._entries.values())) > self.ttl:
+                self._entries.popitem(last=False)
+
+    def revoked_at(self, user_id):
+        if self._redis is not None:
+            # Store errors propagate: failing the request beats accepting a revoked token
+            value = self._redis.get(f"{self.prefix}{user_id}")
+            return float(value) if value is not None else None
+        with self._lock:
+            revoked_at = self._entries.get(user_id)
+            if revoked_at is None:
+                return None
+            if time.time() - revoked_at > self.ttl:
+                del self._entries[user_id]
+                return None
+            return revoked_at
+
+# create_app sets the TTL from JWT_ACCESS_TOKEN_EXPIRES
+revoked_users = RevocationCache(ttl=86400)
+
+@jwt.additional_claims_loader
+def add_exact_issue_time(identity):
+    # iat has whole seconds; revocation must order tokens issued within the same second
+    return {'iat_exact': time.time()}
+
+@jwt.token_in_blocklist_loader
+def check_token_revoked(jwt_header, jwt_payload):
+    revoked_at = revoked_users.revoked_at(jwt_payload['sub']['id'])
+    if revoked_at is None:
+        return False
+    if 'iat_exact' in jwt_payload:
+        return jwt_payload['iat_exact'] <= revoked_at
+    # Older tokens only carry iat: a token from the revocation's second counts as revoked
+    return jwt_payload['iat'] <= int(revoked_at)
+
+@event.listens_for(User.role, 'set')
+def revoke_on_role_change(target, value, oldvalue, initiator):
+    # Tokens carry the role claim, so a role change must invalidate them
+    if target.id is not None and isinstance(oldvalue, str) and oldvalue != value:
+        revoked_users.revoke(target.id)
+
+# Authentication Routes
+@auth_bp.route('/api/auth/register', methods=['POST', 'OPTIONS'])
+@rate_limiter.limit('register')
+def register():
+    if request.method == 'OPTIONS':
+        response = make_response()
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+        response.headers.add('Access-Control-Allow-Methods', 'POST')
+        return response
+
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({'message': 'No data provided'}), 400
+
+        if not data.get('email') or not data.get('password'):
+            return jsonify({'message': 'Email and password are required'}), 400
+
+        existing_user = User.query.filter_by(email=data['email']).first()
+        if existing_user:
+            return jsonify({'message': 'Email already registered'}), 400
+
+        hashed_password = password_hasher.hash(data['password'])
+
+        user = User(
+            name=data.get('name', ''),
+            email=data['email'],
+            password=hashed_password,
+            role=data.get('role', 'freelancer')  # Default to freelancer if not specified
+        )
+
+        db.session.add(user)
+        db.session.commit()
+        logger.info('user registered', extra={'fields': {'user_id': user.id, 'role': user.role}})
+
+        try:
+            access_token = create_access_token(identity=USER.dump(user, 'identity'))
+
+            response_data = {
+                'message': 'User registered successfully',
+                'access_token': access_token,
+                'user': USER.dump(user, 'profile')
+            }
+            return jsonify(response_data), 201
+
+        except Exception as token_error:
+            logger.exception(f"Error creating access token: {str(token_error)}")
+            db.session.rollback()
+            return jsonify({'message': 'Error creating access token'}), 500
+
+    except HashingOverloaded:
+        return server_busy()
+    except Exception as e:
+        logger.exception(f"Registration error: {str(e)}")
+        db.session.rollback()
+        return jsonify({
+            'message': 'Registration failed',
+            'error': str(e),
+            'error_type': type(e).__name__
+        }), 500
+
+@auth_bp.route('/api/auth/login', methods=['POST'])
+@rate_limiter.limit('login')
+def login():
+    data = request.get_json()
+    user = User.query.filter_by(email=data['email']).first()
+
+    try:
+        if not user or not password_hasher.verify(user.password, data['password']):
+            return jsonify({'message': 'Invalid credentials'}), 401
+    except HashingOverloaded:
+        return server_busy()
+
+    # Upgrade hashes made with an older method or cost while we have the password
+    if password_hasher.needs_rehash(user.password):
+        try:
+            user.password = password_hasher.hash(data['password'])
+            db.session.commit()
+        except HashingOverloaded:
+            pass
+
+    access_token = create_access_token(identity=USER.dump(user, 'identity'))
+
+    return jsonify({
+        'access_token': access_token,
+        'user': USER.dump(user, 'profile')
+    }), 200
+
+# User Routes
+@auth_bp.route('/api/auth/me', methods=['GET'])
+@jwt_required()
+def get_current_user():
+    current_user = get_jwt_identity()
+    user = User.query.get(current_user['id'])
+
+    return jsonify(USER.dump(user, 'profile')), 200
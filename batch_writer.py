@@ -0,0 +1,133 @@
+"""Group-commit writer that turns many small inserts into batched ones.
+
+Callers ``submit`` an item and get a Future for its stored result. A single
+background thread drains the queue in FIFO order, so results are produced in
+submission order, and flushes when a batch is full or the oldest item has
+waited ``max_latency`` seconds.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import nullcontext
+
+_STOP = object()
+
+class BatchWriter:
+    def __init__(self, flush, batch_size=100, max_latency=0.005, name='batch-writer', context=None):
+        # flush(items) must return one result per item, in the same order;
+        # context() wraps every flush, e.g. app.app_context
+        self.flush = flush
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.name = name
+        self.context = context or nullcontext
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'batches': 0,
+            'items': 0,
+            'errors': 0,
+            'last_batch_size': 0,
+            'max_batch_size': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+        }
+
+    def configure(self, batch_size, max_latency, context=None):
+        """Apply the app's settings; call before the first submit."""
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.context = context or nullcontext
+
+    def submit(self, item):
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} is closed")
+            # Started lazily so forked workers each get their own thread
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+
+    def close(self, timeout=10):
+        """Flush everything queued so far and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        batches = stats['batches'] or 1
+        stats['queue_depth'] = self._queue.qsize()
+        stats['avg_batch_size'] = round(stats['items'] / batches, 2)
+        stats['avg_flush_ms'] = round(stats.pop('total_flush_ms') / batches, 3)
+        return stats
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is _STOP:
+                break
+
+            batch = [entry]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            # close() enqueues _STOP last, so everything before it is written
+            self._write(batch)
+
+    def _write(self, batch):
+        started = time.perf_counter()
+        try:
+            with self.context():
+                results = self.flush([item for item, _ in batch])
+        except Exception as error:
+            if len(batch) > 1:
+                # Retry row by row so one bad item doesn't fail its batch-mates
+                for entry in batch:
+                    self._write([entry])
+                return
+            batch[0][1].set_exception(error)
+            self._record(1, started, failed=True)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+        self._record(len(batch), started)
+
+    def _record(self, size, started, failed=False):
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            stats = self._stats
+            stats['batches'] += 1
+            stats['items'] += size
+            stats['errors'] += int(failed)
+            stats['last_batch_size'] = size
+            stats['max_batch_size'] = max(stats['max_batch_size'], size)
+            stats['last_flush_ms'] = round(elapsed, 3)
+            stats['max_flush_ms'] = max(stats['max_flush_ms'], round(elapsed, 3))
+            stats['total_flush_ms'] += elapsed
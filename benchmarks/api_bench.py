@@ -0,0 +1,350 @@
+"""Latency and throughput of the API hot paths.
+
+Seeds a throwaway database with synthetic users, projects and proposals, then
+drives login, get_projects, get_available_projects, create_proposal and
+update_proposal concurrently through the Flask test client and/or a real
+threaded WSGI server. Reports p50/p95/p99 latency, requests per second and SQL
+statements per request (from X-SQL-Query-Count), and writes everything to a
+JSON file. Pass --compare with an earlier result to print the change.
+
+    python benchmarks/api_bench.py --projects 5000 --requests 500 --concurrency 16
+    python benchmarks/api_bench.py --mode wsgi --compare bench-results/before.json
+"""
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ['login', 'get_projects', 'get_available_projects', 'create_proposal', 'update_proposal']
+PASSWORD = 'bench-password'
+WORDS = ('python react django flask design logo mobile android ios data science machine learning '
+         'web scraping seo writing blog video editing marketing api backend frontend database sql '
+         'aws devops shopify wordpress figma branding copywriting analytics dashboard').split()
+CATEGORIES = ['web', 'design', 'writing', 'data', 'mobile', 'marketing']
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Workload:
+    """Seeded ids plus thread-safe generators of per-request inputs.
+
+    Mutating scenarios draw inputs that were never used before (a fresh
+    freelancer/project pair to bid on, an untouched project to accept on), so
+    repeated runs and modes measure the same work instead of duplicate errors.
+    """
+
+    def __init__(self, clients, freelancers, projects, proposals_per_project, tokens):
+        self.clients = clients
+        self.freelancers = freelancers
+        self.projects = projects
+        self.proposals_per_project = proposals_per_project
+        self.tokens = tokens
+        self._bids = itertools.count()
+        self._accepts = itertools.count()
+        self._lock = threading.Lock()
+
+    def _next(self, counter):
+        with self._lock:
+            return next(counter)
+
+    def auth(self, user_id):
+        return {'Authorization': f"Bearer {self.tokens[user_id]}"}
+
+    def request(self, scenario, rng):
+        """(method, path, json body, headers) for one request of the scenario."""
+        if scenario == 'login':
+            user_id, email = rng.choice(self.freelancers)
+            return 'POST', '/api/auth/login', {'email': email, 'password': PASSWORD}, {}
+        if scenario == 'get_projects':
+            user_id, _ = rng.choice(self.clients)
+            return 'GET', '/api/projects?limit=50&view=summary', None, self.auth(user_id)
+        if scenario == 'get_available_projects':
+            user_id, _ = rng.choice(self.freelancers)
+            return 'GET', '/api/projects/available?limit=50&view=summary', None, self.auth(user_id)
+        if scenario == 'create_proposal':
+            # Seeded proposals on project j come from freelancers j, j+1, ...; bids
+            # start past them and move one freelancer further per pass
+            n = self._next(self._bids)
+            j = n % len(self.projects)
+            offset = self.proposals_per_project + n // len(self.projects)
+            if offset >= len(self.freelancers):
+                raise RuntimeError('Not enough freelancers for unique bids; seed more users')
+            project_id, _, _ = self.projects[j]
+            user_id, _ = self.freelancers[(j + offset) % len(self.freelancers)]
+            body = {'project_id': project_id, 'cover_letter': 'Benchmark bid', 'bid_amount': rng.randint(50, 5000)}
+            return 'POST', '/api/proposals', body, self.auth(user_id)
+        if scenario == 'update_proposal':
+            n = self._next(self._accepts)
+            if n >= len(self.projects):
+                raise RuntimeError('Every seeded project has been accepted; seed more projects')
+            _, client_id, proposal_id = self.projects[n]
+            return 'PUT', f"/api/proposals/{proposal_id}", {'status': 'accepted'}, self.auth(client_id)
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+def seed(app, args):
+    """Bulk-insert synthetic data and mint a token per user; returns a Workload."""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import insert, select
+
+    from extensions import db, password_hasher
+    from models import Project, Proposal, User
+
+    rng = random.Random(args.seed)
+    password = password_hasher.hash(PASSWORD)
+    now = datetime.utcnow()
+
+    with app.app_context():
+        users = [{'name': f"Client {i}", 'email': f"client{i}@bench.test", 'password': password,
+                  'role': 'client', 'created_at': now} for i in range(args.clients)]
+        users += [{'name': f"Freelancer {i}", 'email': f"freelancer{i}@bench.test", 'password': password,
+                   'role': 'freelancer', 'created_at': now} for i in range(args.freelancers)]
+        db.session.execute(insert(User), users)
+        rows = db.session.execute(select(User.id, User.email, User.role).where(User.email.like('%@bench.test'))).all()
+        clients = [(r.id, r.email) for r in rows if r.role == 'client']
+        freelancers = [(r.id, r.email) for r in rows if r.role == 'freelancer']
+
+        db.session.execute(insert(Project), [{
+            'title': ' '.join(rng.sample(WORDS, 4)).capitalize(),
+            'description': ' '.join(rng.choices(WORDS, k=60)),
+            'category': rng.choice(CATEGORIES),
+            'budget': float(rng.randint(50, 10000)),
+            'status': 'open',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i),
+            'client_id': rng.choice(clients)[0],
+        } for i in range(args.projects)])
+        projects = db.session.execute(select(Project.id, Project.client_id).order_by(Project.id)).all()
+
+        proposals = []
+        for j, project in enumerate(projects):
+            for k in range(args.proposals_per_project):
+                proposals.append({
+                    'cover_letter': 'Seeded proposal',
+                    'bid_amount': float(rng.randint(50, 10000)),
+                    'status': 'pending',
+                    'created_at': now,
+                    'updated_at': now,
+                    'freelancer_id': freelancers[(j + k) % len(freelancers)][0],
+                    'project_id': project.id,
+                })
+        for start in range(0, len(proposals), 5000):
+            db.session.execute(insert(Proposal), proposals[start:start + 5000])
+        db.session.commit()
+
+        first_proposal = dict(db.session.execute(
+            select(Proposal.project_id, db.func.min(Proposal.id)).group_by(Proposal.project_id)
+        ).all())
+        tokens = {
+            user_id: create_access_token(identity={'id': user_id, 'email': email, 'role': role})
+            for role, users in (('client', clients), ('freelancer', freelancers))
+            for user_id, email in users
+        }
+
+    # Accepting needs a proposal, so update_proposal walks the projects that have one
+    project_list = [(p.id, p.client_id, first_proposal.get(p.id)) for p in projects if p.id in first_proposal]
+    return Workload(clients, freelancers, project_list, args.proposals_per_project, tokens)
+
+class TestClientTransport:
+    name = 'test_client'
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def send(self, method, path, body, headers):
+        response = self.client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, response.headers.get('X-SQL-Query-Count')
+
+    def close(self):
+        pass
+
+class WsgiTransport:
+    """Threaded Werkzeug server on a free port; one keep-alive connection per client thread."""
+    name = 'wsgi'
+
+    def __init__(self, app):
+        import logging
+        from werkzeug.serving import make_server
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.local = threading.local()
+
+    def send(self, method, path, body, headers):
+        headers = dict(headers)
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        for attempt in (1, 2):
+            if getattr(self.local, 'conn', None) is None:
+                self.local.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+            try:
+                self.local.conn.request(method, path, body=payload, headers=headers)
+                response = self.local.conn.getresponse()
+                response.read()
+                return response.status, response.getheader('X-SQL-Query-Count')
+            except (http.client.HTTPException, ConnectionError):
+                # Server closed the kept-alive connection; reconnect once
+                self.local.conn.close()
+                self.local.conn = None
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        self.server.shutdown()
+
+def run_scenario(transport, workload, scenario, requests, concurrency, seed):
+    latencies = []
+    statuses = {}
+    sql_counts = []
+    lock = threading.Lock()
+    rngs = threading.local()
+
+    def one(i):
+        if not hasattr(rngs, 'rng'):
+            rngs.rng = random.Random(seed + i)
+        method, path, body, headers = workload.request(scenario, rngs.rng)
+        started = time.perf_counter()
+        status, sql = transport.send(method, path, body, headers)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed * 1000)
+            statuses[status] = statuses.get(status, 0) + 1
+            if sql is not None:
+                sql_counts.append(int(sql))
+
+    # One warm-up request outside the timed run (pools, caches, lazy indexes)
+    one(-1)
+    latencies.clear()
+    statuses.clear()
+    sql_counts.clear()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(requests)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'throughput_rps': round(requests / wall, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3),
+        'sql_per_request': round(sum(sql_counts) / len(sql_counts), 2) if sql_counts else None,
+        'sql_max': max(sql_counts) if sql_counts else None,
+        'statuses': {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results, baseline=None):
+    header = f"{'mode':<12} {'scenario':<24} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'sql':>5}  statuses"
+    print(header)
+    print('-' * len(header))
+    for mode, scenarios in results.items():
+        for scenario, r in scenarios.items():
+            line = f"{mode:<12} {scenario:<24} {r['throughput_rps']:>8} {r['p50_ms']:>8} " \
+                   f"{r['p95_ms']:>8} {r['p99_ms']:>8} {'-' if r['sql_per_request'] is None else r['sql_per_request']:>5}  {r['statuses']}"
+            before = (baseline or {}).get(mode, {}).get(scenario)
+            if before:
+                line += f"  p95 {(r['p95_ms'] - before['p95_ms']) / before['p95_ms']:+.0%}" \
+                        f" rps {(r['throughput_rps'] - before['throughput_rps']) / before['throughput_rps']:+.0%}"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--freelancers', type=int, default=1000)
+    parser.add_argument('--projects', type=int, default=5000)
+    parser.add_argument('--proposals-per-project', type=int, default=3)
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--mode', choices=['test_client', 'wsgi', 'both'], default='both')
+    parser.add_argument('--requests', type=int, default=300, help='requests per scenario')
+    parser.add_argument('--login-requests', type=int, default=50, help='login is CPU-bound; keep it short')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default=None, help='JSON result path (default bench-results/<time>.json)')
+    parser.add_argument('--compare', default=None, help='earlier JSON result to diff against')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    # Every simulated user shares one IP; per-IP limits would throttle the run
+    os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+    sys.path.insert(0, ROOT)
+    from app import create_app, init_db
+    from extensions import password_hasher, response_cache
+
+    app = create_app()
+    with app.app_context():
+        init_db()
+    # One process, so the in-process cache is safe to enable here
+    response_cache.enabled = not args.no_cache
+    started = time.perf_counter()
+    workload = seed(app, args)
+    print(f"seeded {args.clients} clients, {args.freelancers} freelancers, {args.projects} projects, "
+          f"{args.projects * args.proposals_per_project} proposals in {time.perf_counter() - started:.1f}s")
+
+    modes = ['test_client', 'wsgi'] if args.mode == 'both' else [args.mode]
+    results = {}
+    for mode in modes:
+        transport = TestClientTransport(app) if mode == 'test_client' else WsgiTransport(app)
+        results[mode] = {}
+        try:
+            for scenario in args.scenarios:
+                requests = args.login_requests if scenario == 'login' else args.requests
+                results[mode][scenario] = run_scenario(transport, workload, scenario, requests,
+                                                       args.concurrency, args.seed)
+        finally:
+            transport.close()
+    password_hasher.shutdown()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    output = args.output or os.path.join(
+        ROOT, 'bench-results', datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'database': app.config['SQLALCHEMY_DATABASE_URI'].split('://', 1)[0],
+            'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+            'results': results,
+        }, f, indent=2)
+    print(f"wrote {output}")
+
+if __name__ == '__main__':
+    main()
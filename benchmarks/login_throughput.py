@@ -0,0 +1,61 @@
+"""Login throughput against password-hashing pool size.
+
+Runs concurrent POST /api/auth/login calls through the Flask test client for
+each pool size and prints logins per second. Uses a throwaway SQLite database.
+
+    python benchmarks/login_throughput.py --pool-sizes 1 2 4 8 --requests 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--method', default=None, help='hash method, e.g. pbkdf2:sha256:600000')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DATABASE_URL', f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+    # Every simulated user shares one IP; per-IP limits would throttle the run
+    os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+    sys.path.insert(0, ROOT)
+    from app import create_app, init_db
+    from extensions import password_hasher
+
+    app = create_app()
+    with app.app_context():
+        init_db()
+    method = args.method or app.config['PASSWORD_HASH_METHOD']
+    client = app.test_client()
+    client.post('/api/auth/register', json={'email': 'bench@example.com', 'password': 'bench-password'})
+
+    def login(_):
+        return client.post('/api/auth/login', json={
+            'email': 'bench@example.com', 'password': 'bench-password'
+        }).status_code
+
+    print(f"method={method} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'pool':>6} {'logins/s':>10} {'ok':>6} {'503':>6}")
+    for size in args.pool_sizes:
+        # Queue sized to the concurrency so the benchmark measures throughput, not shedding
+        password_hasher.configure(method=method, workers=size, queue_size=args.concurrency)
+        login(None)  # start the pool's worker processes outside the timed run
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            codes = list(executor.map(login, range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+        print(f"{size:>6} {args.requests / elapsed:>10.1f} {codes.count(200):>6} {codes.count(503):>6}")
+    password_hasher.shutdown()
+
+if __name__ == '__main__':
+    main()
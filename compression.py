@@ -0,0 +1,51 @@
+"""Response compression for large JSON and text bodies.
+
+Bodies under the size threshold go out unchanged: below roughly a kilobyte the
+compression overhead outweighs the bytes saved. Brotli is used when the
+optional brotli package is installed and the client accepts it, gzip
+otherwise. Streamed responses are left alone.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+def _encoding(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compress_response(response, accept_encodings, min_size=1024, level=5):
+    """Compress the response body in place when it is worth it; returns the response."""
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _encoding(accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=level))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=level, mtime=0))
+    response.headers['Content-Encoding'] = encoding
+
+    # The compressed bytes differ from the identity encoding, so the entity tag
+    # can only promise semantic equivalence
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,77 @@
+"""Environment-driven database engine configuration.
+
+Values come from the process environment, which ``load_dotenv`` fills from
+``.env``. SQLite gets connection pragmas suited to concurrent writers; server
+databases get connection-pool settings.
+"""
+import os
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+DEFAULT_DATABASE_URL = 'sqlite:///talentlink.db'
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).strip().lower() in ('1', 'true', 'yes', 'on')
+
+def database_url():
+    return os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URL)
+
+def is_sqlite(url):
+    return make_url(url).get_backend_name() == 'sqlite'
+
+def engine_options(url):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database."""
+    if is_sqlite(url):
+        # sqlite3's own lock wait, in seconds; busy_timeout below covers later statements
+        return {'connect_args': {'timeout': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000}}
+
+    return {
+        'pool_size': _env_int('DB_POOL_SIZE', 10),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 20),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', True),
+    }
+
+def sqlite_pragmas():
+    return {
+        'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+        'mmap_size': _env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+    }
+
+def configure_engine(engine):
+    """Register per-connection setup; call before the engine is first used."""
+    if engine.dialect.name != 'sqlite' or engine.url.database in (None, '', ':memory:'):
+        return
+
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def engine_report(engine):
+    """One-line description of the engine and its pool for the startup log."""
+    url = engine.url.render_as_string(hide_password=True)
+    if engine.dialect.name == 'sqlite':
+        settings = ', '.join(f"{k}={v}" for k, v in sqlite_pragmas().items())
+        return f"Database engine: {url} (sqlite; {settings})"
+
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return f"Database engine: {url} ({engine.dialect.name}; {type(pool).__name__})"
+    return (
+        f"Database engine: {url} ({engine.dialect.name}; {type(pool).__name__} "
+        f"size={pool.size()}, max_overflow={pool._max_overflow}, "
+        f"timeout={pool.timeout()}, recycle={pool._recycle}, pre_ping={pool._pre_ping})"
+    )
@@ -0,0 +1,118 @@
+"""Streaming bulk export and import of tables as NDJSON or CSV.
+
+Exports read through a server-side cursor in fixed-size partitions and yield
+one encoded line at a time, so memory use does not grow with the table.
+Imports parse records lazily from a text stream and insert them with
+executemany in batches. Primary keys are kept, so tables must be imported
+parents first; ``dependency_order`` sorts them by their foreign keys.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from sqlalchemy.schema import sort_tables
+
+FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+BATCH_SIZE = 1000
+
+def dependency_order(tables):
+    """Tables sorted so that every table comes after the tables it references."""
+    return sort_tables(tables)
+
+def _to_text(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _from_text(column, value):
+    python_type = column.type.python_type
+    # CSV has no null: an empty field is NULL unless the column is a required string
+    if value is None or (value == '' and (column.nullable or python_type is not str)):
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (int, float) and isinstance(value, str):
+        return python_type(value)
+    return value
+
+def export_lines(conn, table, columns, fmt='ndjson', batch_size=BATCH_SIZE):
+    """Yield the table's rows as NDJSON or CSV lines, ordered by primary key."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    selected = [table.c[name] for name in columns]
+    result = conn.execution_options(yield_per=batch_size).execute(
+        sa.select(*selected).order_by(*table.primary_key.columns)
+    )
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def encode(values):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue()
+
+        yield encode(columns)
+        for row in result:
+            yield encode([_to_text(v) for v in row])
+    else:
+        for row in result:
+            yield json.dumps({name: _to_text(v) for name, v in zip(columns, row)}) + '\n'
+
+def read_records(stream, fmt='ndjson'):
+    """Parse dicts lazily from a text stream of NDJSON or CSV."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'ndjson':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+def _insert(conn, table, skip_existing):
+    if not skip_existing:
+        return sa.insert(table)
+    if conn.dialect.name == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif conn.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise ValueError(f"skip_existing is not supported on {conn.dialect.name}")
+    return insert(table).on_conflict_do_nothing()
+
+def import_records(conn, table, records, defaults=None, skip_existing=False, batch_size=BATCH_SIZE):
+    """Insert records in executemany batches; unknown keys are ignored.
+
+    defaults fills columns the export leaves out (e.g. password hashes). With
+    skip_existing, rows that collide with an existing key are left out instead
+    of failing the import. Returns the number of rows inserted.
+    """
+    defaults = defaults or {}
+    statement = _insert(conn, table, skip_existing)
+    batch = []
+    count = 0
+    for record in records:
+        row = dict(defaults)
+        row.update({c.name: _from_text(c, record[c.name]) for c in table.columns if c.name in record})
+        batch.append(row)
+        if len(batch) >= batch_size:
+            count += conn.execute(statement, batch).rowcount
+            batch = []
+    if batch:
+        count += conn.execute(statement, batch).rowcount
+
+    if count and conn.dialect.name == 'postgresql':
+        # Explicit ids don't advance the serial sequence
+        pk = next(iter(table.primary_key.columns))
+        conn.execute(sa.select(sa.func.setval(
+            sa.func.pg_get_serial_sequence(table.name, pk.name),
+            sa.select(sa.func.max(pk)).scalar_subquery()
+        )))
+    return count
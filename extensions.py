@@ -0,0 +1,37 @@
+"""Extension and service instances shared by the blueprints.
+
+Everything here is created unbound at import: nothing reads configuration,
+opens a connection or starts a thread until ``create_app`` binds and
+configures it. Route modules import from here rather than from ``app``, so
+importing a blueprint never builds an application.
+"""
+import logging
+
+from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from flask_socketio import SocketIO
+from flask_sqlalchemy import SQLAlchemy
+
+from jobs import JobQueue
+from metrics import Registry
+from password_hashing import PasswordHasher
+from profiling import ProfileStore
+from rate_limit import RateLimiter
+from recommender import ProjectIndex
+from response_cache import ResponseCache
+
+logger = logging.getLogger('talentlink')
+
+db = SQLAlchemy()
+jwt = JWTManager()
+socketio = SocketIO()
+cors = CORS()
+
+metrics_registry = Registry()
+profiles = ProfileStore()
+password_hasher = PasswordHasher()
+response_cache = ResponseCache()
+rate_limiter = RateLimiter()
+project_index = ProjectIndex()
+job_queue = JobQueue(logger=logger)
+job_queue.bind(db.session)
@@ -0,0 +1,73 @@
+"""Decorators and responses shared by the route blueprints."""
+from functools import wraps
+
+from flask import jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def server_busy():
+    response = jsonify({'message': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def role_required(role):
+    """Authorize from the signed role claim instead of loading the user."""
+    def decorator(f):
+        @wraps(f)
+        @jwt_required()
+        def decorated_function(*args, **kwargs):
+            current_user = get_jwt_identity()
+            if current_user.get('role') != role:
+                return jsonify({'message': 'Unauthorized'}), 403
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+# Query Budget Instrumentation
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def query_budget(max_queries):
+    """Declare how many SQL statements a route may run per request."""
+    def decorator(f):
+        f.query_budget = max_queries
+        return f
+    return decorator
+
+# Conditional GET
+def conditional_get(validators):
+    """Answer If-None-Match / If-Modified-Since with 304 before the view runs.
+
+    validators(**view_args) returns (etag, last_modified) from a cheap version
+    lookup, or None to let the view handle the request (e.g. to return 403/404).
+    It must apply the same access rules as the view.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            current = validators(**kwargs)
+            if current is None:
+                return f(*args, **kwargs)
+
+            etag, last_modified = current
+            last_modified = last_modified.replace(microsecond=0) if last_modified else None
+            if request.if_none_match:
+                # Weak comparison: compressed responses carry a weak ETag
+                not_modified = request.if_none_match.contains_weak(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and last_modified <= since.replace(tzinfo=None))
+
+            response = make_response('', 304) if not_modified else make_response(f(*args, **kwargs))
+            if response.status_code in (200, 304):
+                response.set_etag(etag)
+                if last_modified:
+                    response.last_modified = last_modified
+            return response
+        return decorated_function
+    return decorator
+
+def collection_etag(prefix, *parts):
+    return f"{prefix}-" + '-'.join(str(p or 0) for p in parts)
@@ -0,0 +1,169 @@
+"""In-process background jobs with retries.
+
+Side effects that the caller doesn't need to wait for (notifications, emails)
+are registered as tasks and enqueued by name. A small pool of worker threads
+runs them; a task that raises is retried with exponential backoff and jitter
+up to ``max_attempts`` times, then counted as failed.
+
+``enqueue_after_commit`` defers enqueueing until the session's transaction
+commits, so a job never runs for data that was rolled back. The queue lives
+in memory: jobs still pending when the process exits are lost, which is the
+right trade for notifications but not for anything that must happen.
+"""
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+from sqlalchemy import event
+
+class _Job:
+    __slots__ = ('name', 'args', 'kwargs', 'attempts', 'enqueued_at')
+
+    def __init__(self, name, args, kwargs):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+class JobQueue:
+    def __init__(self, workers=2, max_attempts=5, backoff=0.5, max_backoff=60.0, max_size=10000,
+                 context=None, logger=None, name='jobs'):
+        # context() wraps every task run, e.g. app.app_context
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_size = max_size
+        self.context = context or nullcontext
+        self.logger = logger or logging.getLogger(__name__)
+        self.name = name
+        self._tasks = {}
+        # (run_at, seq, job); retries wait here until their backoff expires
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._running = 0
+        self._closed = False
+        self._stats = {'enqueued': 0, 'completed': 0, 'retried': 0, 'failed': 0, 'dropped': 0}
+
+    def configure(self, workers, max_attempts, max_size, context=None):
+        """Apply the app's settings; call before the first job is enqueued."""
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.max_size = max_size
+        self.context = context or nullcontext
+
+    def task(self, fn):
+        """Register fn as a task under its function name."""
+        self._tasks[fn.__name__] = fn
+        return fn
+
+    def enqueue(self, name, *args, delay=0.0, **kwargs):
+        """Queue a registered task; returns False if the queue is full or closed."""
+        if name not in self._tasks:
+            raise KeyError(f"Unknown task: {name}")
+        with self._cond:
+            if self._closed or len(self._heap) >= self.max_size:
+                self._stats['dropped'] += 1
+                return False
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), _Job(name, args, kwargs)))
+            self._stats['enqueued'] += 1
+            self._start()
+            self._cond.notify()
+        return True
+
+    def enqueue_after_commit(self, session, name, *args, **kwargs):
+        """Queue the task once session commits; dropped if it rolls back."""
+        if name not in self._tasks:
+            raise KeyError(f"Unknown task: {name}")
+        session.info.setdefault('pending_jobs', []).append((name, args, kwargs))
+
+    def bind(self, session):
+        """Install the commit/rollback hooks enqueue_after_commit relies on."""
+        event.listen(session, 'after_commit', self._after_commit)
+        event.listen(session, 'after_rollback', self._after_rollback)
+
+    def _after_commit(self, session):
+        for name, args, kwargs in session.info.pop('pending_jobs', ()):
+            self.enqueue(name, *args, **kwargs)
+
+    def _after_rollback(self, session):
+        session.info.pop('pending_jobs', None)
+
+    def _start(self):
+        # Called with the lock held; threads start on first use
+        if not self._threads:
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    self._running += 1
+                    return heapq.heappop(self._heap)[2]
+                if self._closed:
+                    return None
+                self._cond.wait(self._heap[0][0] - now if self._heap else None)
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            job.attempts += 1
+            try:
+                with self.context():
+                    self._tasks[job.name](*job.args, **job.kwargs)
+            except Exception:
+                self._failed(job)
+            else:
+                self._finish('completed')
+
+    def _failed(self, job):
+        if job.attempts >= self.max_attempts:
+            self.logger.exception(f"Job {job.name} failed after {job.attempts} attempts")
+            self._finish('failed')
+            return
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (job.attempts - 1)) * random.uniform(0.5, 1.5)
+        self.logger.warning(f"Job {job.name} failed (attempt {job.attempts}), retrying in {delay:.2f}s", exc_info=True)
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), job))
+            self._running -= 1
+            self._stats['retried'] += 1
+            self._cond.notify()
+
+    def _finish(self, outcome):
+        with self._cond:
+            self._running -= 1
+            self._stats[outcome] += 1
+
+    def stats(self):
+        now = time.monotonic()
+        with self._cond:
+            stats = dict(self._stats)
+            ready = [job for run_at, _, job in self._heap if run_at <= now]
+            stats['queue_depth'] = len(self._heap)
+            stats['ready'] = len(ready)
+            stats['scheduled_retries'] = len(self._heap) - len(ready)
+            stats['running'] = self._running
+            stats['oldest_ready_ms'] = round(max((now - job.enqueued_at for job in ready), default=0.0) * 1000, 3)
+        return stats
+
+    def close(self, timeout=5.0):
+        """Finish jobs that are already due, then stop the workers."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
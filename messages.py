@@ -0,0 +1,243 @@
+"""Direct messages over HTTP and Socket.IO."""
+from datetime import datetime
+
+from flask import Blueprint, current_app, jsonify, request, session
+from flask_jwt_extended import decode_token, get_jwt_identity, jwt_required
+from flask_socketio import emit, join_room
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
+
+import migrations
+from auth import check_token_revoked
+from batch_writer import BatchWriter
+from extensions import db, logger, rate_limiter, socketio
+from helpers import MAX_PAGE_SIZE, query_budget
+from models import Conversation, Message, Project, User
+from serializers import MESSAGE, dump_conversation
+
+messages_bp = Blueprint('messages', __name__)
+
+# Message Helpers
+MESSAGE_PAGE_SIZE = 50
+
+def _update_conversations(messages):
+    """Fold a batch of new messages into the conversation summaries."""
+    latest = {}
+    unread = {}
+    for message in messages:
+        pair = Conversation.pair(message.sender_id, message.receiver_id)
+        latest[pair] = message
+        low_delta, high_delta = unread.get(pair, (0, 0))
+        if message.receiver_id == pair[0]:
+            low_delta += 1
+        else:
+            high_delta += 1
+        unread[pair] = (low_delta, high_delta)
+
+    existing = {
+        (c.user_low_id, c.user_high_id): c
+        for c in Conversation.query.filter(or_(*[
+            and_(Conversation.user_low_id == low, Conversation.user_high_id == high)
+            for low, high in latest
+        ]))
+    }
+
+    for pair, message in latest.items():
+        low_delta, high_delta = unread[pair]
+        conversation = existing.get(pair)
+        if conversation is None:
+            conversation = Conversation(
+                user_low_id=pair[0],
+                user_high_id=pair[1],
+                unread_low=low_delta,
+                unread_high=high_delta
+            )
+            db.session.add(conversation)
+        else:
+            # Increment in SQL so a concurrent mark-as-read isn't overwritten
+            conversation.unread_low = Conversation.unread_low + low_delta
+            conversation.unread_high = Conversation.unread_high + high_delta
+
+        conversation.project_id = message.project_id or conversation.project_id
+        conversation.last_message_id = message.id
+        conversation.last_sender_id = message.sender_id
+        conversation.last_message_preview = message.content[:migrations.PREVIEW_LENGTH]
+        conversation.last_message_at = message.created_at
+
+def _insert_messages(rows):
+    """Insert a batch of message rows in one transaction, returning them in order."""
+    messages = [Message(**row) for row in rows]
+    db.session.add_all(messages)
+    db.session.flush()
+    payloads = MESSAGE.dump_many(messages, 'default')
+    _update_conversations(messages)
+    db.session.commit()
+    return payloads
+
+# create_app sets the batch size, latency and the app context each flush runs in
+message_writer = BatchWriter(_insert_messages, name='message-writer')
+
+def _create_message(sender_id, data):
+    """Validate a message and queue it for the batched writer.
+
+    Blocks until its batch is committed and returns the stored message, so the
+    caller can acknowledge a real id. Raises ValueError on bad input.
+    """
+    if not data or not str(data.get('content', '')).strip():
+        raise ValueError('Message content is required')
+    try:
+        receiver_id = int(data.get('receiver_id'))
+    except (TypeError, ValueError):
+        raise ValueError('A valid receiver_id is required')
+    if receiver_id == sender_id:
+        raise ValueError('Cannot send a message to yourself')
+    if db.session.get(User, receiver_id) is None:
+        raise ValueError('Receiver not found')
+
+    project_id = data.get('project_id')
+    if project_id is not None:
+        try:
+            project_id = int(project_id)
+        except (TypeError, ValueError):
+            raise ValueError('A valid project_id is required')
+        if db.session.get(Project, project_id) is None:
+            raise ValueError('Project not found')
+
+    row = {
+        'content': data['content'],
+        'sender_id': sender_id,
+        'receiver_id': receiver_id,
+        'project_id': project_id,
+        'created_at': datetime.utcnow()
+    }
+    return message_writer.submit(row).result(timeout=current_app.config['MESSAGE_ACK_TIMEOUT'])
+
+def _deliver_message(payload, skip_sid=None):
+    """Push a stored message to both participants' rooms."""
+    socketio.emit('receive_message', payload, to=f"user_{payload['receiver_id']}")
+    # Other tabs of the sender; the sending tab already shows the message
+    socketio.emit('receive_message', payload, to=f"user_{payload['sender_id']}", skip_sid=skip_sid)
+    return payload
+
+def _mark_conversation_read(user_id, other_id):
+    """Clear the user's unread state for a conversation, if there is any."""
+    low, high = Conversation.pair(user_id, other_id)
+    conversation = Conversation.query.filter_by(user_low_id=low, user_high_id=high).first()
+    if conversation is None or conversation.unread_for(user_id) == 0:
+        return
+
+    Message.query.filter(
+        Message.sender_id == other_id,
+        Message.receiver_id == user_id,
+        Message.read_at.is_(None)
+    ).update({'read_at': datetime.utcnow()}, synchronize_session=False)
+    unread_column = 'unread_low' if user_id == low else 'unread_high'
+    Conversation.query.filter_by(id=conversation.id).update({unread_column: 0}, synchronize_session=False)
+    db.session.commit()
+
+# Message Routes
+@messages_bp.route('/api/messages', methods=['GET'])
+@query_budget(4)
+@jwt_required()
+def get_messages():
+    try:
+        current_user = get_jwt_identity()
+        other_id = int(request.args['userId'])
+        limit = min(int(request.args.get('limit', MESSAGE_PAGE_SIZE)), MAX_PAGE_SIZE)
+
+        query = Message.query.filter(or_(
+            and_(Message.sender_id == current_user['id'], Message.receiver_id == other_id),
+            and_(Message.sender_id == other_id, Message.receiver_id == current_user['id'])
+        ))
+        if request.args.get('before'):
+            query = query.filter(Message.id < int(request.args['before']))
+
+        # Newest page first, returned oldest-to-newest for display
+        messages = query.order_by(Message.id.desc()).limit(limit).all()
+        result = MESSAGE.dump_many(reversed(messages), 'default')
+
+        if not request.args.get('before'):
+            _mark_conversation_read(current_user['id'], other_id)
+
+        return jsonify(result), 200
+
+    except (KeyError, ValueError, TypeError):
+        return jsonify({'error': 'userId is required and paging parameters must be integers'}), 400
+    except Exception as e:
+        logger.exception(f"Error fetching messages: {str(e)}")
+        return jsonify({'error': 'Failed to fetch messages'}), 500
+
+@messages_bp.route('/api/messages', methods=['POST'])
+@jwt_required()
+@rate_limiter.limit('send_message')
+def send_message():
+    try:
+        current_user = get_jwt_identity()
+        message = _create_message(current_user['id'], request.get_json())
+        return jsonify(_deliver_message(message)), 201
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Error sending message: {str(e)}")
+        return jsonify({'error': 'Failed to send message'}), 500
+
+@messages_bp.route('/api/messages/conversations', methods=['GET'])
+@query_budget(1)
+@jwt_required()
+def get_conversations():
+    try:
+        current_user = get_jwt_identity()
+        user_id = current_user['id']
+
+        conversations = Conversation.query.filter(or_(
+            Conversation.user_low_id == user_id,
+            Conversation.user_high_id == user_id
+        )).options(
+            joinedload(Conversation.low_user),
+            joinedload(Conversation.high_user)
+        ).order_by(Conversation.last_message_at.desc()).all()
+
+        return jsonify([dump_conversation(c, user_id) for c in conversations]), 200
+
+    except Exception as e:
+        logger.exception(f"Error fetching conversations: {str(e)}")
+        return jsonify({'error': 'Failed to fetch conversations'}), 500
+
+# Socket Handlers
+@socketio.on('connect')
+def socket_connect(auth):
+    token = (auth or {}).get('token') or request.args.get('token')
+    if not token:
+        return False
+    try:
+        claims = decode_token(token)
+    except Exception:
+        return False
+    if check_token_revoked(None, claims):
+        return False
+
+    identity = claims['sub']
+    session['user'] = identity
+    join_room(f"user_{identity['id']}")
+
+@socketio.on('join')
+def socket_join(data):
+    # Clients may only subscribe to their own room
+    join_room(f"user_{session['user']['id']}")
+
+@socketio.on('send_message')
+def socket_send_message(data):
+    user_id = session['user']['id']
+    if rate_limiter.check('send_message', {'user': user_id}) is not None:
+        emit('message_error', {'error': 'Too many messages, please slow down'})
+        return {'error': 'Too many messages, please slow down'}
+
+    try:
+        message = _create_message(user_id, data)
+    except ValueError as e:
+        emit('message_error', {'error': str(e)})
+        return {'error': str(e)}
+
+    return _deliver_message(message, skip_sid=request.sid)
@@ -0,0 +1,120 @@
+"""Per-endpoint request metrics in Prometheus text format.
+
+The registry is fed from the request lifecycle (one observation per response)
+and from SQLAlchemy cursor events (every statement, inside a request or not).
+Label values are bounded: endpoints are Flask endpoint names, never raw paths.
+Components that keep their own counters (the message writer, the response
+cache) are exported through collectors that are read at scrape time.
+"""
+import bisect
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in values)
+    return '{' + ','.join(f'{n}="{v}"' for n, v in zip(names, escaped)) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, labels
+        self._values = {}
+
+    def inc(self, labels=(), amount=1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.labels, labels)} {_number(value)}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help, buckets, labels=()):
+        self.name, self.help, self.labels, self.buckets = name, help, labels, buckets
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._values = {}
+
+    def observe(self, value, labels=()):
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                bucket_labels = _labels(self.labels + ('le',), labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self, prefix='talentlink'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._collectors = {}
+        self.requests = Counter(f"{prefix}_http_requests_total", 'Requests by endpoint and status.',
+                                ('endpoint', 'method', 'status'))
+        self.latency = Histogram(f"{prefix}_http_request_duration_seconds",
+                                 'Time from request start to response, excluding streamed bodies.',
+                                 LATENCY_BUCKETS, ('endpoint', 'method'))
+        self.size = Histogram(f"{prefix}_http_response_size_bytes", 'Serialized response body size.',
+                              SIZE_BUCKETS, ('endpoint', 'method'))
+        self.request_queries = Histogram(f"{prefix}_db_queries_per_request", 'SQL statements run per request.',
+                                         QUERY_BUCKETS, ('endpoint',))
+        self.request_query_seconds = Counter(f"{prefix}_db_request_query_seconds_total",
+                                             'Time spent in SQL statements, per endpoint.', ('endpoint',))
+        self.statements = Counter(f"{prefix}_db_statements_total",
+                                  'SQL statements executed, in requests or background work.', ('context',))
+        self.statement_seconds = Counter(f"{prefix}_db_statement_seconds_total",
+                                         'Time spent in SQL statements.', ('context',))
+
+    def observe_request(self, endpoint, method, status, seconds, size, queries, query_seconds):
+        endpoint = endpoint or 'unmatched'
+        with self._lock:
+            self.requests.inc((endpoint, method, str(status)))
+            self.latency.observe(seconds, (endpoint, method))
+            if size is not None:
+                self.size.observe(size, (endpoint, method))
+            self.request_queries.observe(queries, (endpoint,))
+            self.request_query_seconds.inc((endpoint,), query_seconds)
+
+    def observe_statement(self, seconds, in_request):
+        context = ('request',) if in_request else ('background',)
+        with self._lock:
+            self.statements.inc(context)
+            self.statement_seconds.inc(context, seconds)
+
+    def register_collector(self, name, stats):
+        """Export the numeric values of stats() as <prefix>_<name>_<key> gauges.
+
+        Registering a name again replaces its collector.
+        """
+        self._collectors[name] = stats
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.latency, self.size, self.request_queries,
+                           self.request_query_seconds, self.statements, self.statement_seconds):
+                lines.extend(metric.render())
+        for name, stats in list(self._collectors.items()):
+            for key, value in stats().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"{self.prefix}_{name}_{key}"
+                lines.extend([f"# TYPE {metric} gauge", f"{metric} {_number(value)}"])
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,268 @@
+"""Versioned schema migrations for TalentLink.
+
+Each migration is a function taking an open connection. Applied versions are
+recorded in the ``schema_version`` table, so running ``upgrade`` against an
+existing database only applies what is missing. Migrations must describe the
+schema as it was at that version rather than importing the current models.
+"""
+import sqlalchemy as sa
+
+# Schema as it existed before versioned migrations were introduced
+_baseline = sa.MetaData()
+
+sa.Table(
+    'user', _baseline,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(100), nullable=True),
+    sa.Column('email', sa.String(120), unique=True, nullable=False),
+    sa.Column('password', sa.String(255), nullable=False),
+    sa.Column('role', sa.String(20), nullable=False),
+    sa.Column('created_at', sa.DateTime),
+)
+
+sa.Table(
+    'project', _baseline,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('title', sa.String(200), nullable=False),
+    sa.Column('description', sa.Text, nullable=False),
+    sa.Column('category', sa.String(100)),
+    sa.Column('budget', sa.Float, nullable=False),
+    sa.Column('status', sa.String(20)),
+    sa.Column('deadline', sa.DateTime),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('client_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+)
+
+sa.Table(
+    'proposal', _baseline,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('cover_letter', sa.Text, nullable=False),
+    sa.Column('bid_amount', sa.Float, nullable=False),
+    sa.Column('status', sa.String(20)),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('freelancer_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('project.id'), nullable=False),
+)
+
+sa.Table(
+    'message', _baseline,
+    sa.Column('id', sa.Integer, primary_key=True),
+    sa.Column('content', sa.Text, nullable=False),
+    sa.Column('created_at', sa.DateTime),
+    sa.Column('sender_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+    sa.Column('receiver_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+    sa.Column('project_id', sa.Integer, sa.ForeignKey('project.id'), nullable=True),
+)
+
+_schema_version = sa.Table(
+    'schema_version', sa.MetaData(),
+    sa.Column('version', sa.Integer, primary_key=True),
+    sa.Column('description', sa.String(200), nullable=False),
+    sa.Column('applied_at', sa.DateTime, server_default=sa.func.current_timestamp()),
+)
+
+# Migration Helpers
+def _table(conn, name):
+    return sa.Table(name, sa.MetaData(), autoload_with=conn)
+
+def _add_column(conn, table_name, column):
+    if column.name in _table(conn, table_name).c:
+        return
+    preparer = conn.dialect.identifier_preparer
+    ddl = f"ALTER TABLE {preparer.quote(table_name)} ADD COLUMN " \
+          f"{preparer.quote(column.name)} {column.type.compile(conn.dialect)}"
+    for fk in column.foreign_keys:
+        ref_table, ref_column = fk.target_fullname.split('.')
+        ddl += f" REFERENCES {preparer.quote(ref_table)} ({preparer.quote(ref_column)})"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    conn.execute(sa.text(ddl))
+
+def _create_index(conn, name, table_name, *columns, unique=False):
+    table = _table(conn, table_name)
+    sa.Index(name, *[table.c[c] for c in columns], unique=unique).create(conn, checkfirst=True)
+
+# Data Maintenance
+PREVIEW_LENGTH = 200
+
+def rebuild_conversations(conn):
+    """Regenerate every conversation summary from the message history."""
+    message = _table(conn, 'message')
+    conversation = _table(conn, 'conversation')
+
+    low = sa.case((message.c.sender_id < message.c.receiver_id, message.c.sender_id),
+                  else_=message.c.receiver_id)
+    high = sa.case((message.c.sender_id < message.c.receiver_id, message.c.receiver_id),
+                   else_=message.c.sender_id)
+    unread = message.c.read_at.is_(None)
+
+    pairs = sa.select(
+        low.label('user_low_id'),
+        high.label('user_high_id'),
+        sa.func.max(message.c.id).label('last_id'),
+        sa.func.sum(sa.case((sa.and_(unread, message.c.receiver_id == low), 1), else_=0)).label('unread_low'),
+        sa.func.sum(sa.case((sa.and_(unread, message.c.receiver_id == high), 1), else_=0)).label('unread_high'),
+    ).group_by(low, high).subquery()
+
+    last = message.alias('last')
+    summaries = sa.select(
+        pairs.c.user_low_id,
+        pairs.c.user_high_id,
+        last.c.project_id,
+        last.c.id,
+        last.c.sender_id,
+        sa.func.substr(last.c.content, 1, PREVIEW_LENGTH),
+        last.c.created_at,
+        pairs.c.unread_low,
+        pairs.c.unread_high,
+    ).join_from(pairs, last, last.c.id == pairs.c.last_id)
+
+    conn.execute(sa.delete(conversation))
+    conn.execute(sa.insert(conversation).from_select([
+        'user_low_id', 'user_high_id', 'project_id', 'last_message_id', 'last_sender_id',
+        'last_message_preview', 'last_message_at', 'unread_low', 'unread_high'
+    ], summaries))
+
+# Migrations
+def _initial_schema(conn):
+    # Databases created by db.create_all() already have these tables
+    _baseline.create_all(conn, checkfirst=True)
+
+def _lookup_indexes(conn):
+    proposal = _table(conn, 'proposal')
+
+    # Keep one proposal per freelancer so the unique index can be built: the
+    # accepted one if there is one, otherwise the earliest
+    kept = proposal.alias('kept')
+    kept_id = sa.select(kept.c.id).where(
+        kept.c.project_id == proposal.c.project_id,
+        kept.c.freelancer_id == proposal.c.freelancer_id
+    ).order_by(sa.case((kept.c.status == 'accepted', 0), else_=1), kept.c.id).limit(1).scalar_subquery()
+    conn.execute(sa.delete(proposal).where(proposal.c.id != kept_id))
+
+    _create_index(conn, 'uq_proposal_project_freelancer', 'proposal',
+                  'project_id', 'freelancer_id', unique=True)
+    _create_index(conn, 'ix_proposal_freelancer_id', 'proposal', 'freelancer_id')
+    _create_index(conn, 'ix_project_status_created', 'project', 'status', 'created_at')
+    _create_index(conn, 'ix_project_client_created', 'project', 'client_id', 'created_at')
+    _create_index(conn, 'ix_message_receiver_created', 'message', 'receiver_id', 'created_at')
+    _create_index(conn, 'ix_message_sender_created', 'message', 'sender_id', 'created_at')
+
+def _conversation_summaries(conn):
+    _add_column(conn, 'message', sa.Column('read_at', sa.DateTime, nullable=True))
+
+    metadata = sa.MetaData()
+    metadata.reflect(conn, only=['user', 'project', 'message'])
+    sa.Table(
+        'conversation', metadata,
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('user_low_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('user_high_id', sa.Integer, sa.ForeignKey('user.id'), nullable=False),
+        sa.Column('project_id', sa.Integer, sa.ForeignKey('project.id'), nullable=True),
+        sa.Column('last_message_id', sa.Integer, sa.ForeignKey('message.id'), nullable=True),
+        sa.Column('last_sender_id', sa.Integer, nullable=True),
+        sa.Column('last_message_preview', sa.String(200), nullable=True),
+        sa.Column('last_message_at', sa.DateTime, nullable=True),
+        sa.Column('unread_low', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('unread_high', sa.Integer, nullable=False, server_default='0'),
+    ).create(conn, checkfirst=True)
+
+    _create_index(conn, 'uq_conversation_pair', 'conversation', 'user_low_id', 'user_high_id', unique=True)
+    _create_index(conn, 'ix_conversation_low_last', 'conversation', 'user_low_id', 'last_message_at')
+    _create_index(conn, 'ix_conversation_high_last', 'conversation', 'user_high_id', 'last_message_at')
+    rebuild_conversations(conn)
+
+def _project_search_index(conn):
+    # Full-text search uses SQLite FTS5; other databases fall back to LIKE matching
+    if conn.dialect.name != 'sqlite':
+        return
+
+    conn.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS project_fts USING fts5("
+        "title, description, category, content='project', content_rowid='id')"
+    )
+    # Status lives only in project and is filtered through the join, so status
+    # changes need no reindexing
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS project_fts_insert AFTER INSERT ON project BEGIN
+            INSERT INTO project_fts(rowid, title, description, category)
+            VALUES (new.id, new.title, new.description, new.category);
+        END
+    """)
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS project_fts_delete AFTER DELETE ON project BEGIN
+            INSERT INTO project_fts(project_fts, rowid, title, description, category)
+            VALUES ('delete', old.id, old.title, old.description, old.category);
+        END
+    """)
+    conn.exec_driver_sql("""
+        CREATE TRIGGER IF NOT EXISTS project_fts_update
+        AFTER UPDATE OF title, description, category ON project BEGIN
+            INSERT INTO project_fts(project_fts, rowid, title, description, category)
+            VALUES ('delete', old.id, old.title, old.description, old.category);
+            INSERT INTO project_fts(rowid, title, description, category)
+            VALUES (new.id, new.title, new.description, new.category);
+        END
+    """)
+    conn.exec_driver_sql("INSERT INTO project_fts(project_fts) VALUES ('rebuild')")
+
+def _row_versions(conn):
+    for table_name in ('project', 'proposal'):
+        _add_column(conn, table_name, sa.Column('version', sa.Integer, nullable=False, server_default='1'))
+        _add_column(conn, table_name, sa.Column('updated_at', sa.DateTime, nullable=True))
+        table = _table(conn, table_name)
+        conn.execute(sa.update(table).where(table.c.updated_at.is_(None)).values(updated_at=table.c.created_at))
+
+def _project_assignment(conn):
+    _add_column(conn, 'project', sa.Column('freelancer_id', sa.Integer, sa.ForeignKey('user.id'), nullable=True))
+    _add_column(conn, 'project', sa.Column('accepted_proposal_id', sa.Integer, nullable=True))
+
+    project = _table(conn, 'project')
+    proposal = _table(conn, 'proposal')
+    # Correlated on the project being updated; projects without an accepted
+    # proposal are left alone
+    is_accepted = sa.and_(proposal.c.project_id == project.c.id, proposal.c.status == 'accepted')
+
+    def first_accepted(column):
+        return sa.select(column).where(is_accepted).order_by(proposal.c.id).limit(1).scalar_subquery()
+
+    conn.execute(sa.update(project).where(
+        project.c.accepted_proposal_id.is_(None),
+        sa.exists().where(is_accepted)
+    ).values(
+        accepted_proposal_id=first_accepted(proposal.c.id),
+        freelancer_id=first_accepted(proposal.c.freelancer_id)
+    ))
+
+MIGRATIONS = [
+    (1, 'initial schema', _initial_schema),
+    (2, 'lookup indexes and unique proposal per freelancer', _lookup_indexes),
+    (3, 'conversation summaries and message read state', _conversation_summaries),
+    (4, 'project full-text search index', _project_search_index),
+    (5, 'row versions for projects and proposals', _row_versions),
+    (6, 'accepted freelancer and proposal on project', _project_assignment),
+]
+
+def current_version(conn):
+    if not sa.inspect(conn).has_table('schema_version'):
+        return 0
+    return conn.execute(sa.select(sa.func.max(_schema_version.c.version))).scalar() or 0
+
+def upgrade(engine, log=print):
+    """Apply every pending migration, each in its own transaction."""
+    with engine.begin() as conn:
+        _schema_version.create(conn, checkfirst=True)
+        version = current_version(conn)
+
+    for number, description, migrate in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(sa.insert(_schema_version).values(version=number, description=description))
+        log(f"Applied migration {number}: {description}")
+        version = number
+
+    return version
@@ -0,0 +1,109 @@
+"""Database models.
+
+The schema itself is created and changed by ``migrations``; these classes
+only describe it to the ORM.
+"""
+from datetime import datetime
+
+from extensions import db
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=True)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password = db.Column(db.String(255), nullable=False)
+    role = db.Column(db.String(20), nullable=False)  # 'client' or 'freelancer'
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    projects = db.relationship('Project', backref='owner', lazy=True, foreign_keys='Project.client_id')
+    proposals = db.relationship('Proposal', backref='freelancer', lazy=True)
+
+class Project(db.Model):
+    __table_args__ = (
+        db.Index('ix_project_status_created', 'status', 'created_at'),
+        db.Index('ix_project_client_created', 'client_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    category = db.Column(db.String(100))
+    budget = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), default='open')  # open, in_progress, completed
+    deadline = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    client_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    freelancer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    accepted_proposal_id = db.Column(db.Integer, nullable=True)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    proposals = db.relationship('Proposal', backref='project', lazy=True)
+
+    # Bumped on every ORM update; drives ETags and optimistic concurrency
+    __mapper_args__ = {'version_id_col': version}
+
+class Proposal(db.Model):
+    __table_args__ = (
+        db.Index('uq_proposal_project_freelancer', 'project_id', 'freelancer_id', unique=True),
+        db.Index('ix_proposal_freelancer_id', 'freelancer_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    cover_letter = db.Column(db.Text, nullable=False)
+    bid_amount = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, accepted, rejected
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    freelancer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False, server_default='1')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __mapper_args__ = {'version_id_col': version}
+
+class Message(db.Model):
+    __table_args__ = (
+        db.Index('ix_message_receiver_created', 'receiver_id', 'created_at'),
+        db.Index('ix_message_sender_created', 'sender_id', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    receiver_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=True)
+    read_at = db.Column(db.DateTime, nullable=True)
+
+class Conversation(db.Model):
+    """Inbox summary per participant pair, maintained on every message insert.
+
+    The pair is stored ordered (user_low_id < user_high_id) so each pair has
+    exactly one row; unread counters are kept per side.
+    """
+    __table_args__ = (
+        db.Index('uq_conversation_pair', 'user_low_id', 'user_high_id', unique=True),
+        db.Index('ix_conversation_low_last', 'user_low_id', 'last_message_at'),
+        db.Index('ix_conversation_high_last', 'user_high_id', 'last_message_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_low_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_high_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=True)
+    last_message_id = db.Column(db.Integer, db.ForeignKey('message.id'), nullable=True)
+    last_sender_id = db.Column(db.Integer, nullable=True)
+    last_message_preview = db.Column(db.String(200), nullable=True)
+    last_message_at = db.Column(db.DateTime, nullable=True)
+    unread_low = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    unread_high = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    low_user = db.relationship('User', foreign_keys=[user_low_id])
+    high_user = db.relationship('User', foreign_keys=[user_high_id])
+
+    @staticmethod
+    def pair(user_a, user_b):
+        return (user_a, user_b) if user_a < user_b else (user_b, user_a)
+
+    def other_user(self, user_id):
+        return self.high_user if user_id == self.user_low_id else self.low_user
+
+    def unread_for(self, user_id):
+        return self.unread_low if user_id == self.user_low_id else self.unread_high
@@ -0,0 +1,91 @@
+"""Password hashing on a bounded process pool.
+
+pbkdf2/scrypt are deliberately CPU-heavy; running them on the request thread
+holds the GIL and stalls every other request in the worker. The hasher moves
+that work to a small process pool and refuses new work once a fixed number of
+calls are in flight, so a login burst turns into fast 503s instead of a queue
+that grows without bound.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'pbkdf2:sha256:600000'
+
+class HashingOverloaded(Exception):
+    """Raised when the pool is full or a call doesn't finish within the timeout."""
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+def _verify(stored, password):
+    return check_password_hash(stored, password)
+
+class PasswordHasher:
+    def __init__(self, method=DEFAULT_METHOD, workers=None, queue_size=32, timeout=10):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.configure(method, workers, queue_size, timeout)
+
+    def configure(self, method=DEFAULT_METHOD, workers=None, queue_size=32, timeout=10):
+        """Change the method and pool size; a running pool is shut down first."""
+        self.shutdown()
+        self.method = method
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        # Werkzeug fills in defaults ("scrypt" -> "scrypt:32768:8:1"), so the
+        # prefix stored hashes carry is learned from a probe hash on first use
+        self._prefix = None
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingOverloaded('Password hashing queue is full')
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            # The call keeps its slot until it finishes, so the pool stays bounded
+            future.cancel()
+            raise HashingOverloaded('Password hashing timed out')
+
+    def _pool(self):
+        # Created on first use so importing the app doesn't start processes.
+        # Workers are spawned rather than forked: by now the app runs threads
+        # (log listener, job workers, message writer) whose locks a fork could
+        # copy mid-use. Importing the app is cheap, so spawning is only startup cost.
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def hash(self, password):
+        return self._submit(_hash, password, self.method)
+
+    def verify(self, stored, password):
+        return self._submit(_verify, stored, password)
+
+    def needs_rehash(self, stored):
+        """True when the stored hash was made with a different method or cost."""
+        if self._prefix is None:
+            try:
+                self._prefix = self.hash('probe').split('$', 1)[0]
+            except HashingOverloaded:
+                # Try again on a later login rather than add to the backlog
+                return False
+        return stored.split('$', 1)[0] != self._prefix
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,59 @@
+"""On-demand cProfile capture of single requests.
+
+Only one request is profiled at a time: the profiler slows the request it
+wraps, and from Python 3.12 only one profiler can be active per process. The
+most recent reports are kept in memory for admins to fetch by id.
+"""
+import cProfile
+import io
+import itertools
+import pstats
+import threading
+import time
+from collections import OrderedDict
+
+class ProfileStore:
+    def __init__(self, keep=20, top=40):
+        self.keep = keep
+        self.top = top
+        self._reports = OrderedDict()
+        self._ids = itertools.count(1)
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """A running profiler, or None if another request is being profiled."""
+        if not self._active.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def finish(self, profiler, **details):
+        """Stop the profiler and store its report; returns the report id."""
+        profiler.disable()
+        self._active.release()
+
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(self.top)
+        report = dict(details, captured_at=time.time(), total_calls=stats.total_calls,
+                      total_seconds=round(stats.total_tt, 6), stats=output.getvalue())
+
+        with self._lock:
+            profile_id = next(self._ids)
+            self._reports[profile_id] = report
+            while len(self._reports) > self.keep:
+                self._reports.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._reports.get(profile_id)
+
+    def summaries(self):
+        with self._lock:
+            return [
+                {'id': profile_id, **{k: v for k, v in report.items() if k != 'stats'}}
+                for profile_id, report in reversed(self._reports.items())
+            ]
@@ -0,0 +1,444 @@
+"""Project listings, search, recommendations and detail."""
+import base64
+import threading
+import time
+from datetime import datetime
+
+from flask import Blueprint, jsonify, make_response, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import defer, joinedload
+
+from extensions import db, job_queue, logger, project_index, rate_limiter, response_cache
+from helpers import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, conditional_get, query_budget, role_required
+from models import Project, Proposal
+from serializers import PROJECT
+
+projects_bp = Blueprint('projects', __name__)
+
+# CORS Helper Functions
+def _build_cors_preflight_response():
+    response = make_response()
+    response.headers.add('Access-Control-Allow-Headers', "Content-Type,Authorization")
+    response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+    response.headers.add('Access-Control-Allow-Credentials', 'true')
+    return response
+
+def _corsify_actual_response(response):
+    # Let Flask-CORS handle the CORS headers
+    return response
+
+# Pagination Helpers
+def _encode_cursor(project):
+    raw = f"{project.created_at.isoformat()}|{project.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor):
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    created_at, project_id = raw.rsplit('|', 1)
+    return datetime.fromisoformat(created_at), int(project_id)
+
+def _wants_page():
+    # Keep the legacy plain-list response unless the client opts in
+    return any(key in request.args for key in ('limit', 'cursor', 'view'))
+
+def _filter_projects(query, allow_status=True):
+    args = request.args
+    if args.get('category'):
+        query = query.filter(Project.category == args['category'])
+    if allow_status and args.get('status'):
+        query = query.filter(Project.status == args['status'])
+    if args.get('min_budget'):
+        query = query.filter(Project.budget >= float(args['min_budget']))
+    if args.get('max_budget'):
+        query = query.filter(Project.budget <= float(args['max_budget']))
+    if args.get('view') == 'summary':
+        query = query.options(defer(Project.description))
+    return query
+
+def _paginate_projects(query):
+    """Keyset pagination on (created_at, id), newest first."""
+    limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    if limit < 1:
+        raise ValueError('limit must be positive')
+
+    if request.args.get('cursor'):
+        created_at, project_id = _decode_cursor(request.args['cursor'])
+        query = query.filter(or_(
+            Project.created_at < created_at,
+            and_(Project.created_at == created_at, Project.id < project_id)
+        ))
+
+    rows = query.order_by(Project.created_at.desc(), Project.id.desc()).limit(limit + 1).all()
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+def _omitted_fields():
+    # view=summary drops the long description from list responses
+    return ('description',) if request.args.get('view') == 'summary' else ()
+
+def _project_page_response(query, view):
+    serialize = PROJECT.view(view, omit=_omitted_fields())
+    if not _wants_page():
+        return jsonify([serialize(p) for p in query.all()])
+
+    projects, next_cursor = _paginate_projects(query)
+    return jsonify({
+        'items': [serialize(p) for p in projects],
+        'next_cursor': next_cursor
+    })
+
+# Project Routes
+@projects_bp.route('/api/projects', methods=['GET'])
+@query_budget(1)
+@jwt_required()
+@response_cache.cached(lambda: ['projects'])
+def get_projects():
+    try:
+        query = _filter_projects(Project.query)
+        return _project_page_response(query, 'list')
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid pagination or filter parameters'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@projects_bp.route('/api/projects/my-projects', methods=['GET'])
+@query_budget(1)
+@role_required('client')
+@response_cache.cached(lambda: [f"my-projects:{get_jwt_identity()['id']}"])
+def get_my_projects():
+    try:
+        current_user = get_jwt_identity()
+        projects = Project.query.filter_by(client_id=current_user['id']).all()
+        return jsonify(PROJECT.dump_many(projects, 'owned'))
+    except Exception as e:
+        logger.exception(f"Error fetching projects: {str(e)}")
+        return jsonify({'error': 'Failed to fetch projects'}), 500
+
+@projects_bp.route('/api/projects', methods=['POST', 'OPTIONS'])
+@role_required('client')
+@rate_limiter.limit('create_project')
+def create_project():
+    if request.method == 'OPTIONS':
+        return _build_cors_preflight_response()
+        
+    try:
+        current_user = get_jwt_identity()
+        data = request.get_json()
+        
+        # Convert budget to float, handling different formats
+        try:
+            if isinstance(data['budget'], str):
+                budget = float(data['budget'].replace('$', '').replace(',', '').strip())
+            else:
+                budget = float(data['budget'])
+        except (ValueError, KeyError) as e:
+            return jsonify({'error': 'Invalid budget format'}), 400
+        
+        # Handle deadline if provided
+        deadline = None
+        if data.get('deadline'):
+            try:
+                deadline = datetime.strptime(data['deadline'], '%Y-%m-%d')
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        # Create and save the project
+        project = Project(
+            title=data.get('title', ''),
+            description=data.get('description', ''),
+            category=data.get('category'),
+            budget=budget,
+            status='open',
+            client_id=current_user['id'],
+            deadline=deadline
+        )
+        
+        db.session.add(project)
+        db.session.commit()
+        response_cache.invalidate('projects', f"my-projects:{project.client_id}")
+        project_index.add(project.id, project.title, project.description, project.category,
+                          project.budget, project.status, project.client_id)
+        
+        response = jsonify({
+            'message': 'Project created successfully', 
+            'project_id': project.id,
+            'project': PROJECT.dump(project, 'created')
+        })
+        
+        return _corsify_actual_response(response), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Error creating project: {str(e)}")
+        return _corsify_actual_response(jsonify({'error': str(e)})), 500
+
+def _available_to(freelancer_id):
+    """Criteria for open projects the freelancer doesn't own and hasn't bid on."""
+    return (
+        Project.status == 'open',
+        Project.client_id != freelancer_id,
+        ~Project.proposals.any(Proposal.freelancer_id == freelancer_id)
+    )
+
+@projects_bp.route('/api/projects/available', methods=['GET'])
+@query_budget(1)
+@role_required('freelancer')
+def get_available_projects():
+    try:
+        # Get projects that are open and not created by the current user
+        current_user = get_jwt_identity()
+        
+        query = Project.query.filter(*_available_to(current_user['id']))
+        query = _filter_projects(query, allow_status=False).options(joinedload(Project.owner))
+        return _project_page_response(query, 'available')
+        
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid pagination or filter parameters'}), 400
+    except Exception as e:
+        logger.exception(f"Error fetching available projects: {str(e)}")
+        return jsonify({'error': 'Failed to fetch available projects'}), 500
+
+# Project Recommendations
+# Seconds between full reconciliations of the index with the database
+PROJECT_INDEX_RESYNC = 300
+PROJECT_INDEX_COLUMNS = (Project.id, Project.title, Project.description, Project.category,
+                         Project.budget, Project.status, Project.client_id)
+_project_index_sync_lock = threading.Lock()
+_project_index_state_lock = threading.Lock()
+_project_index_state = {'synced_at': None, 'queued': False}
+
+@job_queue.task
+def sync_project_index():
+    """Add every project the index is missing, whatever its id.
+
+    Runs as a job: the first build reads the whole table, and imports can add
+    projects with ids below ones already indexed.
+    """
+    try:
+        with _project_index_sync_lock:
+            known = project_index.ids()
+            all_ids = [project_id for (project_id,) in db.session.query(Project.id)]
+            missing = [project_id for project_id in all_ids if project_id not in known]
+            for start in range(0, len(missing), 1000):
+                rows = db.session.query(*PROJECT_INDEX_COLUMNS).filter(Project.id.in_(missing[start:start + 1000]))
+                for row in rows:
+                    project_index.add(*row)
+            project_index.synced_id = max([project_index.synced_id] + all_ids)
+        with _project_index_state_lock:
+            _project_index_state['synced_at'] = time.monotonic()
+    finally:
+        with _project_index_state_lock:
+            _project_index_state['queued'] = False
+
+def queue_project_index_sync(force=False):
+    """Queue sync_project_index when the index was never built or is due a resync.
+
+    Returns whether the index has completed a full sync.
+    """
+    with _project_index_state_lock:
+        synced_at = _project_index_state['synced_at']
+        due = force or synced_at is None or time.monotonic() - synced_at > PROJECT_INDEX_RESYNC
+        # A forced sync runs even if one is pending, which may have read the ids already
+        queue = force or (due and not _project_index_state['queued'])
+        if queue:
+            _project_index_state['queued'] = True
+    if queue and not job_queue.enqueue('sync_project_index'):
+        with _project_index_state_lock:
+            _project_index_state['queued'] = False
+    return synced_at is not None
+
+def _sync_new_projects():
+    """Load projects created since the last sync, e.g. by other workers.
+
+    Skipped while a full sync holds the lock; it will pick them up.
+    """
+    if not _project_index_sync_lock.acquire(blocking=False):
+        return
+    try:
+        rows = db.session.query(*PROJECT_INDEX_COLUMNS).filter(
+            Project.id > project_index.synced_id
+        ).order_by(Project.id).yield_per(1000)
+        for row in rows:
+            project_index.add(*row)
+            project_index.synced_id = row.id
+    finally:
+        _project_index_sync_lock.release()
+
+@projects_bp.route('/api/projects/recommended', methods=['GET'])
+@query_budget(3)
+@role_required('freelancer')
+def get_recommended_projects():
+    try:
+        current_user = get_jwt_identity()
+        limit = min(int(request.args.get('limit', 20)), MAX_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError('limit must be positive')
+
+        serialize = PROJECT.view('available', omit=_omitted_fields())
+        if not queue_project_index_sync():
+            # The index is still being built in the background; newest first meanwhile
+            projects = Project.query.filter(*_available_to(current_user['id'])).options(
+                joinedload(Project.owner)
+            ).order_by(Project.created_at.desc(), Project.id.desc()).limit(limit).all()
+            return jsonify({'items': [dict(serialize(p), score=0.0) for p in projects], 'indexing': True}), 200
+
+        _sync_new_projects()
+        history = db.session.query(
+            Proposal.project_id, Proposal.status, Proposal.bid_amount
+        ).filter(Proposal.freelancer_id == current_user['id']).all()
+
+        # Over-fetch: the index may not have seen status changes made by other workers
+        scores = dict(project_index.recommend(current_user['id'], history, limit * 2))
+        projects = []
+        if scores:
+            projects = Project.query.filter(
+                Project.id.in_(scores), Project.status == 'open'
+            ).options(joinedload(Project.owner)).all()
+            for project_id in scores.keys() - {p.id for p in projects}:
+                project_index.set_open(project_id, False)
+        projects.sort(key=lambda p: scores[p.id], reverse=True)
+
+        items = []
+        for p in projects[:limit]:
+            data = serialize(p)
+            data['score'] = round(scores[p.id], 4)
+            items.append(data)
+
+        return jsonify({'items': items}), 200
+
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid limit parameter'}), 400
+    except Exception as e:
+        logger.exception(f"Error recommending projects: {str(e)}")
+        return jsonify({'error': 'Failed to recommend projects'}), 500
+
+# Project Search
+# BM25 column weights for (title, description, category)
+PROJECT_SEARCH_WEIGHTS = (10.0, 1.0, 5.0)
+
+def _fts_match_query(text):
+    """Turn free text into an FTS5 query: every term must match, last one as a prefix."""
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+def _like_pattern(term):
+    """%term% with LIKE wildcards in the term matched literally (escape character \\)."""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+def _search_projects(text):
+    """Query of (Project, rank) for a search; lower rank is a better match."""
+    if db.engine.dialect.name == 'sqlite':
+        fts = db.table('project_fts', db.column('rowid'))
+        match_target = db.literal_column('project_fts')
+        rank = func.bm25(match_target, *PROJECT_SEARCH_WEIGHTS)
+        query = db.session.query(Project, rank.label('rank')).join(
+            fts, fts.c.rowid == Project.id
+        ).filter(match_target.op('MATCH')(_fts_match_query(text)))
+        return query, rank
+
+    # No FTS5 outside SQLite: every term must appear in one of the text columns
+    rank = db.literal(0.0)
+    query = db.session.query(Project, rank.label('rank'))
+    for term in text.split():
+        pattern = _like_pattern(term)
+        query = query.filter(or_(
+            Project.title.ilike(pattern, escape='\\'),
+            Project.description.ilike(pattern, escape='\\'),
+            Project.category.ilike(pattern, escape='\\')
+        ))
+    return query, rank
+
+@projects_bp.route('/api/projects/search', methods=['GET'])
+@query_budget(1)
+@jwt_required()
+def search_projects():
+    try:
+        current_user = get_jwt_identity()
+        text = request.args.get('q', '').strip()
+        if not text:
+            return jsonify({'error': 'Search query is required'}), 400
+
+        query, rank = _search_projects(text)
+        if request.args.get('available', '').lower() in ('1', 'true'):
+            query = query.filter(*_available_to(current_user['id']))
+        query = _filter_projects(query).options(joinedload(Project.owner))
+
+        limit = min(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        # Keyset on (rank, id); ranks are deterministic for a given query
+        if request.args.get('cursor'):
+            raw = base64.urlsafe_b64decode(request.args['cursor'].encode()).decode()
+            last_rank, last_id = raw.rsplit('|', 1)
+            last_rank, last_id = float(last_rank), int(last_id)
+            query = query.filter(or_(rank > last_rank, and_(rank == last_rank, Project.id > last_id)))
+
+        rows = query.order_by(rank, Project.id).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            last_project, last_rank = rows[limit - 1]
+            next_cursor = base64.urlsafe_b64encode(f"{last_rank!r}|{last_project.id}".encode()).decode()
+
+        serialize = PROJECT.view('search', omit=_omitted_fields())
+        items = []
+        for p, score in rows[:limit]:
+            data = serialize(p)
+            data['rank'] = score
+            items.append(data)
+
+        return jsonify({'items': items, 'next_cursor': next_cursor}), 200
+
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid pagination or filter parameters'}), 400
+    except Exception as e:
+        logger.exception(f"Error searching projects: {str(e)}")
+        return jsonify({'error': 'Failed to search projects'}), 500
+
+# Project Detail Routes
+def _project_validators(project_id):
+    current_user = get_jwt_identity()
+    has_proposal = db.exists().where(
+        Proposal.project_id == Project.id,
+        Proposal.freelancer_id == current_user['id']
+    )
+    row = db.session.query(
+        Project.client_id, Project.version, Project.updated_at, has_proposal
+    ).filter(Project.id == project_id).first()
+    if row is None:
+        return None
+
+    client_id, version, updated_at, allowed = row
+    if client_id != current_user['id'] and not allowed and current_user['role'] != 'admin':
+        return None
+    return f"project-{project_id}-v{version}", updated_at
+
+@projects_bp.route('/api/projects/<int:project_id>', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@conditional_get(_project_validators)
+@response_cache.cached(lambda project_id: [f"project:{project_id}"], per_user=True)
+def get_project(project_id):
+    try:
+        current_user = get_jwt_identity()
+        project = Project.query.options(joinedload(Project.owner)).get_or_404(project_id)
+        
+        # Check if current user is the owner or has a proposal
+        if project.client_id != current_user['id']:
+            # Check if user has a proposal for this project
+            proposal = Proposal.query.filter_by(
+                project_id=project_id,
+                freelancer_id=current_user['id']
+            ).first()
+            
+            if not proposal and current_user['role'] != 'admin':
+                return jsonify({'error': 'Not authorized to view this project'}), 403
+        
+        return jsonify(PROJECT.dump(project, 'detail')), 200
+        
+    except Exception as e:
+        logger.exception(f"Error fetching project: {str(e)}")
+        return jsonify({'error': 'Failed to fetch project details'}), 500
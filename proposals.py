@@ -0,0 +1,308 @@
+"""Proposals: submitting, listing and accepting or rejecting them."""
+import smtplib
+from datetime import datetime
+from email.message import EmailMessage
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import case, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+
+from extensions import db, job_queue, logger, project_index, rate_limiter, response_cache, socketio
+from helpers import collection_etag, conditional_get, query_budget, role_required
+from models import Project, Proposal
+from serializers import PROPOSAL
+
+proposals_bp = Blueprint('proposals', __name__)
+
+# Notifications
+@job_queue.task
+def send_email(to, subject, body):
+    message = EmailMessage()
+    message['From'] = current_app.config['SMTP_FROM']
+    message['To'] = to
+    message['Subject'] = subject
+    message.set_content(body)
+    with smtplib.SMTP(current_app.config['SMTP_HOST'], current_app.config['SMTP_PORT'], timeout=10) as smtp:
+        smtp.send_message(message)
+
+def _queue_email(to, subject, body):
+    # One job per email, so a retry never re-sends to recipients that already got it
+    if current_app.config['SMTP_HOST'] and to:
+        job_queue.enqueue('send_email', to, subject, body)
+
+@job_queue.task
+def notify_new_proposal(proposal_id):
+    """Tell the project's client about a new proposal."""
+    proposal = db.session.get(Proposal, proposal_id, options=[
+        joinedload(Proposal.project).joinedload(Project.owner),
+        joinedload(Proposal.freelancer)
+    ])
+    # Nothing to notify if the proposal or its project is gone; retrying won't help
+    if proposal is None or proposal.project is None:
+        return
+    project = proposal.project
+    socketio.emit('new_proposal', {
+        'proposal_id': proposal.id,
+        'project_id': project.id,
+        'project_title': project.title,
+        'freelancer_name': proposal.freelancer.name,
+        'bid_amount': proposal.bid_amount
+    }, to=f"user_{project.client_id}")
+    _queue_email(
+        project.owner.email, f"New proposal for {project.title}",
+        f"{proposal.freelancer.name or 'A freelancer'} bid {proposal.bid_amount} on \"{project.title}\"."
+    )
+
+@job_queue.task
+def notify_proposal_decision(project_id, proposal_id=None):
+    """Tell freelancers their proposal was accepted or rejected.
+
+    With proposal_id only that proposal's freelancer is told; otherwise every
+    proposal on the project is, as when accepting one rejects the rest.
+    """
+    query = Proposal.query.filter_by(project_id=project_id).options(
+        joinedload(Proposal.project), joinedload(Proposal.freelancer)
+    )
+    if proposal_id is not None:
+        query = query.filter(Proposal.id == proposal_id)
+    for proposal in query:
+        project = proposal.project
+        socketio.emit('proposal_status', {
+            'proposal_id': proposal.id,
+            'project_id': project.id,
+            'project_title': project.title,
+            'status': proposal.status
+        }, to=f"user_{proposal.freelancer_id}")
+        outcome = 'was accepted' if proposal.status == 'accepted' else 'was not selected'
+        _queue_email(
+            proposal.freelancer.email, f"Your proposal for {project.title}",
+            f"Your proposal for \"{project.title}\" {outcome}."
+        )
+
+# Proposal Routes
+PROPOSAL_FIELDS = ('cover_letter', 'bid_amount', 'project_id')
+
+def _is_duplicate_proposal(error):
+    # PostgreSQL names the violated index, SQLite its columns
+    message = str(error.orig)
+    return 'uq_proposal_project_freelancer' in message or 'proposal.project_id, proposal.freelancer_id' in message
+
+@proposals_bp.route('/api/proposals', methods=['POST'])
+@role_required('freelancer')
+@rate_limiter.limit('create_proposal')
+def create_proposal():
+    try:
+        current_user = get_jwt_identity()
+        data = request.get_json()
+
+        missing = [field for field in PROPOSAL_FIELDS if data.get(field) is None]
+        if missing:
+            return jsonify({'error': f"Missing required fields: {', '.join(missing)}"}), 400
+
+        try:
+            project_id = int(data['project_id'])
+        except (TypeError, ValueError):
+            return jsonify({'error': 'A valid project_id is required'}), 400
+        project = db.session.get(Project, project_id)
+        if project is None:
+            return jsonify({'error': 'Project not found'}), 404
+        if project.status != 'open':
+            return jsonify({'error': 'This project is no longer accepting proposals'}), 409
+        if project.client_id == current_user['id']:
+            return jsonify({'error': 'You cannot submit a proposal for your own project'}), 400
+        
+        proposal = Proposal(
+            cover_letter=data['cover_letter'],
+            bid_amount=data['bid_amount'],
+            freelancer_id=current_user['id'],
+            project_id=project.id
+        )
+        
+        db.session.add(proposal)
+        try:
+            db.session.flush()
+            job_queue.enqueue_after_commit(db.session, 'notify_new_proposal', proposal.id)
+            db.session.commit()
+        except IntegrityError as e:
+            # The unique (project_id, freelancer_id) index rejects duplicates atomically
+            db.session.rollback()
+            if not _is_duplicate_proposal(e):
+                raise
+            return jsonify({'error': 'You have already submitted a proposal for this project'}), 400
+        # The freelancer can now view the project
+        response_cache.invalidate(f"project:{proposal.project_id}")
+        
+        return jsonify({
+            'message': 'Proposal submitted successfully',
+            'proposal_id': proposal.id
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+
+def _accepted_proposals_validators():
+    current_user = get_jwt_identity()
+    row = db.session.query(
+        func.count(Proposal.id),
+        func.max(Proposal.id),
+        func.sum(Proposal.version),
+        func.sum(Project.version),
+        func.max(Proposal.updated_at),
+        func.max(Project.updated_at)
+    ).join(Project, Project.id == Proposal.project_id).filter(
+        Proposal.freelancer_id == current_user['id']
+    ).one()
+    count, max_id, proposal_versions, project_versions, proposal_updated, project_updated = row
+    last_modified = max(filter(None, (proposal_updated, project_updated)), default=None)
+    etag = collection_etag(f"freelancer-{current_user['id']}-proposals",
+                            count, max_id, proposal_versions, project_versions)
+    return etag, last_modified
+
+@proposals_bp.route('/api/proposals/accepted', methods=['GET'])
+@query_budget(2)
+@role_required('freelancer')
+@conditional_get(_accepted_proposals_validators)
+def get_accepted_proposals():
+    try:
+        current_user = get_jwt_identity()
+        
+        # Get all proposals for the current freelancer, with project and client in one query
+        proposals = Proposal.query.filter_by(
+            freelancer_id=current_user['id']
+        ).options(
+            joinedload(Proposal.project).joinedload(Project.owner)
+        ).all()
+        
+        return jsonify(PROPOSAL.dump_many(proposals, 'for_freelancer'))
+        
+    except Exception as e:
+        logger.exception(f"Error fetching accepted proposals: {str(e)}")
+        return jsonify({'error': 'Failed to fetch accepted proposals'}), 500
+
+def _project_proposals_validators(project_id):
+    current_user = get_jwt_identity()
+    row = db.session.query(
+        Project.client_id,
+        func.count(Proposal.id),
+        func.max(Proposal.id),
+        func.sum(Proposal.version),
+        func.max(Proposal.updated_at)
+    ).outerjoin(Proposal, Proposal.project_id == Project.id).filter(
+        Project.id == project_id
+    ).group_by(Project.id).first()
+    if row is None:
+        return None
+
+    client_id, count, max_id, versions, updated_at = row
+    if client_id != current_user['id'] and current_user['role'] != 'admin':
+        return None
+    return collection_etag(f"project-{project_id}-proposals", count, max_id, versions), updated_at
+
+@proposals_bp.route('/api/projects/<int:project_id>/proposals', methods=['GET'])
+@query_budget(3)
+@jwt_required()
+@conditional_get(_project_proposals_validators)
+def get_project_proposals(project_id):
+    try:
+        current_user = get_jwt_identity()
+        project = Project.query.get_or_404(project_id)
+        
+        # Only project owner can view proposals
+        if project.client_id != current_user['id'] and current_user['role'] != 'admin':
+            return jsonify({'error': 'Not authorized to view these proposals'}), 403
+        
+        proposals = Proposal.query.filter_by(project_id=project_id).options(
+            joinedload(Proposal.freelancer)
+        ).all()
+        
+        return jsonify(PROPOSAL.dump_many(proposals, 'for_client')), 200
+        
+    except Exception as e:
+        logger.exception(f"Error fetching project proposals: {str(e)}")
+        return jsonify({'error': 'Failed to fetch project proposals'}), 500
+
+@proposals_bp.route('/api/proposals/<int:proposal_id>', methods=['PUT'])
+@jwt_required()
+def update_proposal(proposal_id):
+    try:
+        current_user = get_jwt_identity()
+        data = request.get_json()
+        
+        if 'status' not in data or data['status'] not in ['accepted', 'rejected']:
+            return jsonify({'error': 'Invalid status. Must be "accepted" or "rejected"'}), 400
+            
+        proposal = Proposal.query.get_or_404(proposal_id)
+        project = Project.query.get_or_404(proposal.project_id)
+        
+        # Only project owner can update proposal status
+        if project.client_id != current_user['id'] and current_user['role'] != 'admin':
+            return jsonify({'error': 'Not authorized to update this proposal'}), 403
+            
+        client_id = project.client_id
+        project_status = project.status
+
+        if data['status'] == 'accepted':
+            # Atomic open -> in_progress transition; of concurrent accepts only one matches
+            now = datetime.utcnow()
+            claimed = db.session.execute(
+                update(Project).where(
+                    Project.id == project.id,
+                    Project.status == 'open'
+                ).values(
+                    status='in_progress',
+                    freelancer_id=proposal.freelancer_id,
+                    accepted_proposal_id=proposal.id,
+                    version=Project.version + 1,
+                    updated_at=now
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            if not claimed:
+                db.session.rollback()
+                return jsonify({'error': 'This project is no longer open for accepting proposals'}), 409
+
+            # Accept this proposal and reject all others in one statement
+            db.session.execute(
+                update(Proposal).where(Proposal.project_id == project.id).values(
+                    status=case((Proposal.id == proposal.id, 'accepted'), else_='rejected'),
+                    version=Proposal.version + 1,
+                    updated_at=now
+                ).execution_options(synchronize_session=False)
+            )
+            job_queue.enqueue_after_commit(db.session, 'notify_proposal_decision', project.id)
+            db.session.commit()
+            project_status = 'in_progress'
+
+            # Project status changed; drop every cached view that shows it
+            response_cache.invalidate('projects', f"project:{project.id}", f"my-projects:{client_id}")
+            project_index.set_open(project.id, False)
+        else:
+            # Only pending proposals can be rejected; conditional like the accept path, so a
+            # proposal accepted concurrently isn't flipped behind the project's back
+            rejected = db.session.execute(
+                update(Proposal).where(
+                    Proposal.id == proposal.id,
+                    Proposal.status == 'pending'
+                ).values(
+                    status='rejected',
+                    version=Proposal.version + 1,
+                    updated_at=datetime.utcnow()
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            if not rejected:
+                db.session.rollback()
+                return jsonify({'error': f"Only pending proposals can be rejected (this one is {proposal.status})"}), 409
+            job_queue.enqueue_after_commit(db.session, 'notify_proposal_decision', project.id, proposal.id)
+            db.session.commit()
+        
+        return jsonify({
+            'message': f'Proposal {data["status"]} successfully',
+            'project_status': project_status
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.exception(f"Error updating proposal: {str(e)}")
+        return jsonify({'error': 'Failed to update proposal'}), 500
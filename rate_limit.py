@@ -0,0 +1,220 @@
+"""Token-bucket rate limiting for auth and write endpoints.
+
+A policy is a set of limits on one route, each keyed by something about the
+caller: the client IP, the authenticated user id, or the account a login is
+aimed at together with the IP it comes from. Pairing the account with the IP
+stops anyone from locking a victim out by draining the account's bucket.
+Every limit is a token bucket holding up to ``count`` tokens that refills at
+``count`` per ``period``, so short bursts pass and sustained abuse is held at
+the configured rate.
+
+The in-process backend keeps a bounded number of buckets, evicting the least
+recently used; an evicted bucket comes back full, which errs on the side of
+letting requests through. It only sees its own process's traffic; use the
+Redis backend when several workers serve the API.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+DEFAULT_LIMITS = {
+    'login.ip': '30/minute',
+    'login.account_ip': '10/minute',
+    'register.ip': '20/hour',
+    'create_project.user': '30/minute',
+    'create_proposal.user': '30/minute',
+    'create_proposal.ip': '120/minute',
+    'send_message.user': '120/minute',
+}
+
+class Rate:
+    def __init__(self, count, period):
+        self.count = count
+        self.period = period
+
+    @classmethod
+    def parse(cls, spec):
+        # "10/minute"
+        count, period = spec.split('/', 1)
+        return cls(int(count), PERIODS[period.strip().rstrip('s')])
+
+    @property
+    def per_second(self):
+        return self.count / self.period
+
+def parse_limits(spec, defaults=DEFAULT_LIMITS):
+    """{policy: [(key, Rate)]} from defaults overridden by "login.ip=5/minute,..."."""
+    limits = dict(defaults)
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, rate = item.split('=', 1)
+        limits[name.strip()] = rate.strip()
+
+    policies = {}
+    for name, rate in limits.items():
+        policy, key = name.split('.', 1)
+        if rate.lower() in ('', 'off', 'none'):
+            continue
+        policies.setdefault(policy, []).append((key, Rate.parse(rate)))
+    return policies
+
+class MemoryBackend:
+    """Token buckets in a bounded LRU."""
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate):
+        """(allowed, seconds until a token is available)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rate.count, now))
+            tokens = min(rate.count, tokens + (now - updated) * rate.per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        return allowed, 0.0 if allowed else (1 - tokens) / rate.per_second
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'keys': len(self._buckets), 'evictions': self.evictions}
+
+class RedisBackend:
+    """Buckets shared by all workers; needs the optional redis package."""
+
+    # Refill, take and expire atomically, using the server clock so workers agree
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, url, prefix='talentlink:ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_URL points at Redis but the redis package is not installed')
+        self._redis = redis.Redis.from_url(url)
+        self._take = self._redis.register_script(self.SCRIPT)
+        self.prefix = prefix
+
+    def take(self, key, rate):
+        allowed, tokens = self._take(keys=[self.prefix + key], args=[rate.per_second, rate.count])
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / rate.per_second
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+class RateLimiter:
+    def __init__(self, backend=None, policies=None):
+        self.backend = backend or MemoryBackend()
+        self.policies = parse_limits('') if policies is None else policies
+        self.enabled = True
+        self._counters = {'limited': 0, 'backend_errors': 0}
+        self._lock = threading.Lock()
+
+    def configure(self, url, max_keys, spec):
+        """Pick the backend and limits for the app's settings; call before serving requests."""
+        self.policies = parse_limits(spec)
+        if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+            self.backend = RedisBackend(url)
+        else:
+            self.backend = MemoryBackend(max_keys=max_keys)
+
+    @staticmethod
+    def _identify(key):
+        if key == 'ip':
+            return request.remote_addr
+        if key == 'user':
+            identity = get_jwt_identity()
+            return identity['id'] if identity else None
+        if key == 'account_ip':
+            data = request.get_json(silent=True) or {}
+            email = data.get('email')
+            return f"{email.strip().lower()}|{request.remote_addr}" if isinstance(email, str) else None
+        raise ValueError(f"Unknown rate limit key: {key}")
+
+    def check(self, policy, identities=None):
+        """Seconds to wait if any of the policy's limits is exhausted, else None.
+
+        identities supplies key values directly (e.g. {'user': 7}) where there
+        is no JWT-authenticated request to read them from, as in socket events.
+        """
+        if not self.enabled:
+            return None
+        retry_after = None
+        for key, rate in self.policies.get(policy, ()):
+            value = identities[key] if identities and key in identities else self._identify(key)
+            if value is None:
+                continue
+            try:
+                allowed, wait = self.backend.take(f"{policy}:{key}:{value}", rate)
+            except Exception:
+                # A broken shared store must not take the API down with it
+                self._count('backend_errors')
+                continue
+            if not allowed:
+                retry_after = max(retry_after or 0.0, wait)
+        if retry_after is not None:
+            self._count('limited')
+        return retry_after
+
+    def limit(self, policy):
+        """Answer 429 with Retry-After once the caller exhausts the policy.
+
+        Place it below jwt_required/role_required when the policy has a
+        'user' limit, so the identity is known.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if request.method != 'OPTIONS':
+                    retry_after = self.check(policy)
+                    if retry_after is not None:
+                        # Auth views report errors under 'message', the rest under 'error'
+                        message = 'Too many requests, please retry later'
+                        response = jsonify({'error': message, 'message': message})
+                        response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+                        return response, 429
+                return f(*args, **kwargs)
+            return decorated_function
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update(self.backend.stats())
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
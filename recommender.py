@@ -0,0 +1,178 @@
+"""Project recommendations for freelancers.
+
+Projects are embedded as hashed term-frequency vectors (title, description and
+a boosted category token) in one dense float32 matrix, with document
+frequencies kept alongside so IDF weights can be applied at query time. A
+freelancer's profile is the weighted sum of the rows of projects they bid on
+or won; scoring every project is then one matrix-vector product, plus a
+budget-fit term from their historical bid amounts.
+
+The index lives in process memory. Rows are appended as projects are created
+and a status mask marks projects that are no longer open; callers should still
+re-check status against the database for the rows they return.
+"""
+import math
+import re
+import threading
+import zlib
+
+import numpy as np
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have i in is it of on or our that the this to we will with you your'.split()
+)
+CATEGORY_WEIGHT = 3.0
+# Proposal status -> how strongly that project shapes the freelancer's profile
+HISTORY_WEIGHTS = {'accepted': 2.0, 'pending': 1.0, 'rejected': 0.5}
+TEXT_WEIGHT = 0.8
+BUDGET_WEIGHT = 0.2
+# Refresh IDF weights and row norms once the index has grown by this fraction
+IDF_REFRESH_GROWTH = 0.05
+
+def tokenize(text):
+    return [t for t in TOKEN_RE.findall((text or '').lower()) if len(t) > 1 and t not in STOPWORDS]
+
+class ProjectIndex:
+    def __init__(self, dim=256, capacity=1024):
+        self._lock = threading.Lock()
+        self.configure(dim, capacity)
+
+    def configure(self, dim, capacity=1024):
+        """Set the feature dimension; this empties the index."""
+        with self._lock:
+            self.dim = dim
+            self._size = 0
+            self._ids = np.zeros(capacity, dtype=np.int64)
+            self._tf = np.zeros((capacity, dim), dtype=np.float32)
+            self._norms = np.zeros(capacity, dtype=np.float32)
+            self._log_budget = np.zeros(capacity, dtype=np.float32)
+            self._open = np.zeros(capacity, dtype=bool)
+            self._client = np.zeros(capacity, dtype=np.int64)
+            self._df = np.zeros(dim, dtype=np.float64)
+            self._rows = {}
+            self._idf = np.ones(dim, dtype=np.float32)
+            self._idf_size = 0
+            # Highest project id loaded from the database; add() leaves it alone so
+            # projects added out of order by this process don't hide earlier ones
+            self.synced_id = 0
+
+    def __len__(self):
+        return self._size
+
+    def ids(self):
+        """Snapshot of the indexed project ids."""
+        with self._lock:
+            return set(self._rows)
+
+    def _vectorize(self, title, description, category):
+        counts = {}
+        tokens = tokenize(title) + tokenize(description)
+        for token in tokens:
+            bucket = zlib.crc32(token.encode()) % self.dim
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+        if category:
+            bucket = zlib.crc32(f"cat:{category.lower()}".encode()) % self.dim
+            counts[bucket] = counts.get(bucket, 0.0) + CATEGORY_WEIGHT
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for bucket, count in counts.items():
+            vector[bucket] = 1.0 + math.log(count)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _grow(self):
+        capacity = len(self._ids) * 2
+        for name in ('_ids', '_norms', '_log_budget', '_open', '_client'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+        tf = np.zeros((capacity, self.dim), dtype=np.float32)
+        tf[:self._size] = self._tf[:self._size]
+        self._tf = tf
+
+    def _refresh_idf(self):
+        # IDF and the IDF-weighted row norms move together; between refreshes new
+        # rows are normed against the current snapshot, which drifts only slightly
+        size = self._size
+        self._idf = (np.log((1.0 + size) / (1.0 + self._df)) + 1.0).astype(np.float32)
+        tf = self._tf[:size]
+        self._norms[:size] = np.sqrt(np.einsum('ij,ij->i', tf, tf * self._idf ** 2))
+        self._idf_size = size
+
+    def add(self, project_id, title, description, category, budget, status, client_id):
+        vector = self._vectorize(title, description, category)
+        with self._lock:
+            if project_id in self._rows:
+                return
+            if self._size == len(self._ids):
+                self._grow()
+            row = self._size
+            self._ids[row] = project_id
+            self._tf[row] = vector
+            self._norms[row] = np.linalg.norm(vector * self._idf)
+            self._log_budget[row] = math.log1p(max(budget or 0.0, 0.0))
+            self._open[row] = status == 'open'
+            self._client[row] = client_id
+            self._df += vector > 0
+            self._rows[project_id] = row
+            self._size += 1
+
+    def set_open(self, project_id, is_open):
+        with self._lock:
+            row = self._rows.get(project_id)
+            if row is not None:
+                self._open[row] = is_open
+
+    def recommend(self, freelancer_id, history, limit=20):
+        """Rank open projects for a freelancer.
+
+        history is a list of (project_id, proposal_status, bid_amount). Returns
+        [(project_id, score)] best first, excluding projects the freelancer
+        owns or has already bid on.
+        """
+        with self._lock:
+            size = self._size
+            if size == 0:
+                return []
+            tf = self._tf[:size]
+            if size > self._idf_size * (1 + IDF_REFRESH_GROWTH):
+                self._refresh_idf()
+            ids = self._ids[:size]
+            candidates = self._open[:size] & (self._client[:size] != freelancer_id)
+
+            profile = np.zeros(self.dim, dtype=np.float32)
+            bids = []
+            for project_id, status, bid_amount in history:
+                row = self._rows.get(project_id)
+                if row is not None:
+                    profile += HISTORY_WEIGHTS.get(status, 1.0) * tf[row]
+                    candidates[row] = False
+                if bid_amount:
+                    bids.append(bid_amount)
+
+            if not candidates.any():
+                return []
+
+            if profile.any():
+                # Cosine similarity of IDF-weighted vectors without materializing them
+                profile_norm = np.linalg.norm(profile * self._idf)
+                text = (tf @ (profile * self._idf ** 2)) / np.maximum(self._norms[:size] * profile_norm, 1e-9)
+            else:
+                text = np.zeros(size, dtype=np.float32)
+
+            if bids:
+                typical = math.log1p(float(np.median(bids)))
+                budget_fit = np.exp(-np.abs(self._log_budget[:size] - typical))
+            else:
+                budget_fit = np.full(size, 0.5, dtype=np.float32)
+
+            scores = TEXT_WEIGHT * text + BUDGET_WEIGHT * budget_fit
+            # Newer projects win ties, which also orders cold-start results by recency
+            scores = np.where(candidates, scores + ids * 1e-12, -np.inf)
+
+            count = min(limit, int(candidates.sum()))
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+            return [(int(ids[i]), float(scores[i])) for i in top]
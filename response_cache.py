@@ -0,0 +1,175 @@
+"""Response cache for read-heavy GET endpoints.
+
+Cached responses are grouped into namespaces (``projects``, ``project:42``,
+``my-projects:7``). Each namespace has a generation counter that is part of
+every key stored under it; invalidating a namespace bumps its generation, so
+old entries become unreachable at once. Because the generation is read before
+the view runs, a response computed from pre-invalidation data is written under
+the old generation and can never be served afterwards.
+
+Every key also carries the generation of ``ALL``, so ``invalidate_all`` can drop
+the whole cache after bulk changes such as an import.
+
+The in-process backend only sees invalidations made by its own process, so
+another worker could keep serving a project's old status until the TTL runs
+out. Caching is therefore off unless configured: use the Redis backend when
+several workers serve the API, and ``memory`` only for a single process.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, make_response, request
+from flask_jwt_extended import get_jwt_identity
+
+class MemoryBackend:
+    """Bounded LRU with per-entry TTL."""
+
+    def __init__(self, max_size=1024, ttl=30):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        # Generations are never evicted; losing one could resurrect stale entries
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generations(self, namespaces):
+        with self._lock:
+            return [self._generations.get(ns, 0) for ns in namespaces]
+
+    def bump(self, namespaces):
+        with self._lock:
+            for ns in namespaces:
+                self._generations[ns] = self._generations.get(ns, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'size': len(self._entries), 'evictions': self.evictions}
+
+class RedisBackend:
+    """Shared cache for multi-worker deployments; needs the optional redis package."""
+
+    def __init__(self, url, ttl=30, prefix='talentlink:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RESPONSE_CACHE_URL points at Redis but the redis package is not installed')
+        self._redis = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self._redis.get(self.prefix + key)
+
+    def set(self, key, value):
+        self._redis.set(self.prefix + key, value, ex=self.ttl)
+
+    def generations(self, namespaces):
+        values = self._redis.mget([f"{self.prefix}gen:{ns}" for ns in namespaces])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, namespaces):
+        pipe = self._redis.pipeline()
+        for ns in namespaces:
+            pipe.incr(f"{self.prefix}gen:{ns}")
+        pipe.execute()
+
+    def stats(self):
+        return {'backend': 'redis', 'evictions': self._redis.info('stats').get('evicted_keys', 0)}
+
+# Namespace every cached response depends on
+ALL = '*'
+
+class ResponseCache:
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self.enabled = True
+        self._counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        self._lock = threading.Lock()
+
+    def configure(self, url, max_size, ttl):
+        """Pick the backend for the app's settings; call before serving requests.
+
+        url is a redis:// URL, "memory" for a single-process deployment, or
+        empty to leave caching off.
+        """
+        if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+            self.backend = RedisBackend(url, ttl=ttl)
+        else:
+            self.backend = MemoryBackend(max_size=max_size, ttl=ttl)
+        self.enabled = bool(url)
+
+    def cached(self, namespaces, per_user=False):
+        """Cache successful responses of a GET view.
+
+        namespaces(**view_args) returns the namespaces the response depends on.
+        With per_user the key is also scoped to the JWT identity, for views
+        whose output or access check depends on the caller.
+        """
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                if not self.enabled:
+                    return f(*args, **kwargs)
+
+                names = [ALL] + namespaces(**kwargs)
+                generations = self.backend.generations(names)
+                key = ':'.join([request.endpoint, request.full_path] +
+                               [f"{ns}@{gen}" for ns, gen in zip(names, generations)])
+                if per_user:
+                    key += f":user={get_jwt_identity()['id']}"
+
+                body = self.backend.get(key)
+                if body is not None:
+                    self._count('hits')
+                    response = Response(body, mimetype='application/json')
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count('misses')
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200:
+                    self.backend.set(key, response.get_data())
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return decorated_function
+        return decorator
+
+    def invalidate(self, *namespaces):
+        self.backend.bump(namespaces)
+        self._count('invalidations', len(namespaces))
+
+    def invalidate_all(self):
+        self.invalidate(ALL)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats.update(self.backend.stats())
+        return stats
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
@@ -0,0 +1,146 @@
+"""Model serializers and the app's JSON provider.
+
+Each serializer declares named views as field lists; a view compiles to one
+``operator.attrgetter`` over all its attribute paths, so building a dict is a
+single C call plus ``zip`` rather than per-field Python code. Fields are
+``'name'`` or ``'key=dotted.path'``; a ``(key, callable)`` pair is allowed for
+values that need computing. Datetimes are left as objects and encoded by the
+JSON provider.
+
+The provider uses orjson when it is installed and otherwise falls back to
+Flask's stdlib encoder; both write datetimes as ISO 8601.
+"""
+from datetime import date, datetime
+from operator import attrgetter
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def iso(value):
+    return value.isoformat() if value is not None else None
+
+class Serializer:
+    def __init__(self, **views):
+        self._fields = {name: [self._parse(field) for field in fields] for name, fields in views.items()}
+        self._compiled = {}
+
+    @staticmethod
+    def _parse(field):
+        if isinstance(field, tuple):
+            return field
+        key, _, path = field.partition('=')
+        return key, path or key
+
+    def view(self, name, omit=()):
+        """Function turning one object into a dict with the view's fields."""
+        cache_key = (name, tuple(omit))
+        compiled = self._compiled.get(cache_key)
+        if compiled is None:
+            fields = [(key, getter) for key, getter in self._fields[name] if key not in omit]
+            compiled = self._compiled[cache_key] = self._compile(fields)
+        return compiled
+
+    @staticmethod
+    def _compile(fields):
+        keys = tuple(key for key, _ in fields)
+        if all(isinstance(getter, str) for _, getter in fields):
+            get = attrgetter(*(getter for _, getter in fields))
+            if len(keys) == 1:
+                return lambda obj: {keys[0]: get(obj)}
+            return lambda obj: dict(zip(keys, get(obj)))
+        getters = [(key, attrgetter(getter) if isinstance(getter, str) else getter) for key, getter in fields]
+        return lambda obj: {key: get(obj) for key, get in getters}
+
+    def dump(self, obj, view, omit=()):
+        return self.view(view, omit)(obj)
+
+    def dump_many(self, objs, view, omit=()):
+        serialize = self.view(view, omit)
+        return [serialize(obj) for obj in objs]
+
+_PROJECT_BASE = ('id', 'title', 'description', 'category', 'budget', 'status', 'deadline', 'created_at')
+
+PROJECT = Serializer(
+    list=_PROJECT_BASE + ('client_id',),
+    owned=_PROJECT_BASE,
+    created=('id', 'title', 'status', 'created_at'),
+    available=_PROJECT_BASE + ('client_name=owner.name',),
+    search=_PROJECT_BASE + ('client_id', 'client_name=owner.name'),
+    detail=_PROJECT_BASE + ('client_id', 'client_name=owner.name', 'freelancer_id', 'accepted_proposal_id'),
+)
+
+PROPOSAL = Serializer(
+    for_freelancer=(
+        'id', 'project_id', 'project_title=project.title', 'project_description=project.description',
+        'proposal_status=status', 'project_status=project.status', 'bid_amount', 'cover_letter',
+        'client_name=project.owner.name', 'client_id=project.client_id', 'created_at',
+        'deadline=project.deadline',
+    ),
+    for_client=(
+        'id', 'freelancer_id', 'freelancer_name=freelancer.name', 'freelancer_email=freelancer.email',
+        'cover_letter', 'bid_amount', 'status', 'created_at',
+    ),
+)
+
+USER = Serializer(
+    profile=('id', 'name', 'email', 'role'),
+    # JWT identity claims
+    identity=('id', 'email', 'role'),
+)
+
+# Messages are also emitted over Socket.IO, whose encoder knows nothing about
+# datetimes, so their timestamp is converted here
+MESSAGE = Serializer(
+    default=('id', 'sender_id', 'receiver_id', 'project_id', 'content',
+             ('created_at', lambda m: iso(m.created_at))),
+)
+
+def dump_conversation(conversation, user_id):
+    """A conversation summary as seen by user_id."""
+    other = conversation.other_user(user_id)
+    return {
+        'id': conversation.id,
+        'user_id': other.id,
+        'user_name': other.name,
+        'user_role': other.role,
+        'project_id': conversation.project_id,
+        'unread_count': conversation.unread_for(user_id),
+        'last_message': {
+            'id': conversation.last_message_id,
+            'sender_id': conversation.last_sender_id,
+            'content': conversation.last_message_preview,
+            'created_at': conversation.last_message_at,
+        },
+    }
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return DefaultJSONProvider.default(value)
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+    sort_keys = False
+
+class OrjsonProvider(JSONProvider):
+    # Naive datetimes are written without an offset, like datetime.isoformat()
+    option = orjson.OPT_NON_STR_KEYS if orjson else 0
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+def json_provider(app):
+    return OrjsonProvider(app) if orjson is not None else StdlibJSONProvider(app)
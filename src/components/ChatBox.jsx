@@ -1,33 +1,24 @@
 import React, { useEffect, useState, useRef } from "react";
-import { io } from "socket.io-client";
+import { socket } from "../socket";
 
 const ChatBox = () => {
-  const [socket, setSocket] = useState(null);
   const [message, setMessage] = useState("");
   const [receiverId, setReceiverId] = useState("");
   const [messages, setMessages] = useState([]);
   const [error, setError] = useState("");
   const messagesEndRef = useRef(null);
+  // The shared client authenticates with the stored token; the user is only needed for display
+  const user_id = String(JSON.parse(localStorage.getItem("user") || "{}").id ?? "");
 
   useEffect(() => {
-    const user_id = localStorage.getItem("user_id"); // your logged-in user id
-
-    const newSocket = io("http://localhost:5000", {
-      query: { user_id },
-    });
-
-    setSocket(newSocket);
-
-    newSocket.on("connect", () => {
-      console.log("Connected to Socket.IO as user:", user_id);
-    });
-
-    newSocket.on("receive_message", (data) => {
+    const handleMessage = (data) => {
       console.log("Received message:", data);
       setMessages((prev) => [...prev, data]);
-    });
+    };
+
+    socket.on("receive_message", handleMessage);
 
-    return () => newSocket.disconnect();
+    return () => socket.off("receive_message", handleMessage);
   }, []);
 
   useEffect(() => {
@@ -35,25 +26,27 @@ const ChatBox = () => {
       setError("Real-time chat is currently unavailable. Messages will be saved locally only.");
     }
     
-    const savedMessages = localStorage.getItem(`chat_${localStorage.getItem("user_id")}_${receiverId}`);
+    const savedMessages = localStorage.getItem(`chat_${user_id}_${receiverId}`);
     if (savedMessages) {
       setMessages(JSON.parse(savedMessages));
     }
-  }, [receiverId, socket]);
+  }, [receiverId]);
 
   const sendMessage = () => {
     if (socket && receiverId && message) {
-      const sender_id = localStorage.getItem("user_id");
-
       const msg = {
-        sender_id,
         receiver_id: receiverId,
         content: message,
-        timestamp: new Date().toISOString(),
       };
 
-      socket.emit("send_message", msg);
-      setMessages((prev) => [...prev, msg]);
+      // The acknowledgement is the stored message, or { error }
+      socket.emit("send_message", msg, (stored) => {
+        if (stored?.error) {
+          setError(stored.error);
+          return;
+        }
+        setMessages((prev) => [...prev, stored]);
+      });
       setMessage("");
     }
   };
@@ -69,11 +62,11 @@ const ChatBox = () => {
             style={{
               ...styles.message,
               alignSelf:
-                msg.sender_id === localStorage.getItem("user_id")
+                String(msg.sender_id) === user_id
                   ? "flex-end"
                   : "flex-start",
               backgroundColor:
-                msg.sender_id === localStorage.getItem("user_id")
+                String(msg.sender_id) === user_id
                   ? "#DCF8C6"
                   : "#FFF",
             }}
@@ -14,10 +14,10 @@ function FreelancerMessagePage() {
       return;
     }
 
-    if (currentUser) {
+    if (storedUser) {
       try {
-        socket.emit("join", { room: `user_${currentUser.id}` });
-        console.log(`Freelancer joined room: user_${currentUser.id}`);
+        socket.emit("join", { room: `user_${storedUser.id}` });
+        console.log(`Freelancer joined room: user_${storedUser.id}`);
       } catch (err) {
         console.error("Error joining socket room:", err);
         setError("Could not connect to the messaging service. Some features may be limited.");
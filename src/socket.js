@@ -1,12 +1,11 @@
 // src/socket.js
-// Socket.io client initialization is currently disabled
-// Uncomment and configure this if you set up WebSocket support in your backend
-/*
 import { io } from "socket.io-client";
 
 // Use your Flask backend URL
-const socket = io("http://127.0.0.1:5000", {
+export const socket = io("http://127.0.0.1:5000", {
   transports: ["websocket"], // Use WebSocket directly
+  // The server authenticates the connection with the JWT and joins the user's room
+  auth: (cb) => cb({ token: localStorage.getItem("token") }),
   reconnection: true,
   reconnectionAttempts: 5,
   reconnectionDelay: 1000,
@@ -21,6 +20,3 @@ socket.on("disconnect", () => {
 });
 
 export default socket;
-*/
-
-export const socket = null;
@@ -0,0 +1,122 @@
+"""JSON logging that never blocks the request thread.
+
+Records go through a bounded in-memory queue to a background QueueListener
+that does the actual I/O. When the queue is full, records are dropped and
+counted rather than making the request wait. Sensitive keys are redacted
+before anything is serialized.
+"""
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+SENSITIVE_KEYS = {'authorization', 'password', 'access_token', 'token', 'cookie', 'set-cookie', 'secret'}
+REDACTED = '[redacted]'
+
+def redact(value):
+    """Copy of value with sensitive keys masked, recursing into dicts and lists."""
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in SENSITIVE_KEYS else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    return value
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(redact(getattr(record, 'fields', {})))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking or raising when full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # The base class folds the traceback into msg; keep it apart for the 'exc' field.
+        # Render it here so the queued record doesn't pin the traceback's frames.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class Sampler:
+    """Per-endpoint sampling rates, e.g. {'get_projects': 0.1}; unlisted endpoints log everything."""
+
+    def __init__(self, rates):
+        self.rates = rates
+
+    @classmethod
+    def parse(cls, spec):
+        # "get_projects=0.1,get_available_projects=0.25"
+        rates = {}
+        for item in filter(None, (part.strip() for part in spec.split(','))):
+            endpoint, rate = item.split('=', 1)
+            rates[endpoint.strip()] = float(rate)
+        return cls(rates)
+
+    def should_log(self, endpoint):
+        # Blueprint endpoints ("projects.get_projects") may be listed by view name alone
+        rate = self.rates.get(endpoint)
+        if rate is None:
+            rate = self.rates.get((endpoint or '').rpartition('.')[2], 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+# Logger name -> its running listener, so reconfiguring replaces rather than adds one
+_listeners = {}
+
+def configure(name='talentlink', level='INFO', queue_size=10000, stream=None):
+    """Attach a non-blocking JSON handler to the named logger.
+
+    Returns (logger, handler, listener). Configuring the same logger again
+    stops its previous listener; call shutdown() at exit to flush queued records.
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    handler = DroppingQueueHandler(log_queue)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, output, respect_handler_level=False)
+    listener.start()
+
+    logger = logging.getLogger(name)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.handlers = [handler]
+    logger.propagate = False
+    # After the swap, so the old listener drains everything its handler queued
+    shutdown(name)
+    _listeners[name] = listener
+    return logger, handler, listener
+
+def shutdown(name='talentlink'):
+    """Stop the named logger's listener, writing out the records still queued."""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,51 @@
+import itertools
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+_emails = itertools.count(1)
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmp_path_factory.mktemp('db')}/test.db"
+    os.environ['LOG_LEVEL'] = 'WARNING'
+    os.environ['SQL_QUERY_BUDGET_ENFORCE'] = '1'
+    # Every test client shares one IP
+    os.environ['RATE_LIMIT_ENABLED'] = '0'
+    os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+
+    from app import create_app, init_db
+    from extensions import password_hasher
+
+    app = create_app({'TESTING': True})
+    with app.app_context():
+        init_db()
+    yield app
+    password_hasher.shutdown()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def make_user(app):
+    """make_user(role) -> (user_id, auth headers), inserted directly to skip password hashing."""
+    from flask_jwt_extended import create_access_token
+
+    from extensions import db
+    from models import User
+    from serializers import USER
+
+    def make(role):
+        with app.app_context():
+            user = User(name=f"{role} {next(_emails)}", email=f"{role}-{next(_emails)}@test.local",
+                        password='!', role=role)
+            db.session.add(user)
+            db.session.commit()
+            token = create_access_token(identity=USER.dump(user, 'identity'))
+            return user.id, {'Authorization': f"Bearer {token}"}
+    return make
@@ -0,0 +1,70 @@
+import threading
+from collections import Counter
+
+from extensions import db
+from models import Project, Proposal
+
+FREELANCERS = 16
+ROUNDS = 3
+
+def test_concurrent_accepts_pick_exactly_one_proposal(app, client, make_user):
+    _, owner = make_user('client')
+    freelancers = [make_user('freelancer')[1] for _ in range(FREELANCERS)]
+
+    for round_number in range(ROUNDS):
+        project_id = client.post('/api/projects', json={
+            'title': f"Race {round_number}", 'description': 'race', 'budget': 100
+        }, headers=owner).get_json()['project_id']
+        proposal_ids = [
+            client.post('/api/proposals', json={
+                'project_id': project_id, 'cover_letter': 'me', 'bid_amount': 50
+            }, headers=headers).get_json()['proposal_id']
+            for headers in freelancers
+        ]
+
+        barrier = threading.Barrier(len(proposal_ids))
+        results = {}
+
+        def accept(proposal_id):
+            barrier.wait()
+            results[proposal_id] = client.put(
+                f"/api/proposals/{proposal_id}", json={'status': 'accepted'}, headers=owner
+            ).status_code
+
+        threads = [threading.Thread(target=accept, args=(pid,)) for pid in proposal_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        codes = Counter(results.values())
+        assert codes == {200: 1, 409: len(proposal_ids) - 1}
+        winner = next(pid for pid, code in results.items() if code == 200)
+
+        with app.app_context():
+            project = db.session.get(Project, project_id)
+            accepted = Proposal.query.filter_by(project_id=project_id, status='accepted').all()
+            pending = Proposal.query.filter_by(project_id=project_id, status='pending').count()
+            assert project.status == 'in_progress'
+            assert project.accepted_proposal_id == winner
+            assert [p.id for p in accepted] == [winner]
+            assert project.freelancer_id == accepted[0].freelancer_id
+            assert pending == 0
+
+def test_accepted_proposal_cannot_be_rejected(app, client, make_user):
+    _, owner = make_user('client')
+    _, freelancer = make_user('freelancer')
+    project_id = client.post('/api/projects', json={
+        'title': 'Reject', 'description': 'reject', 'budget': 100
+    }, headers=owner).get_json()['project_id']
+    proposal_id = client.post('/api/proposals', json={
+        'project_id': project_id, 'cover_letter': 'me', 'bid_amount': 50
+    }, headers=freelancer).get_json()['proposal_id']
+
+    assert client.put(f"/api/proposals/{proposal_id}", json={'status': 'accepted'}, headers=owner).status_code == 200
+    assert client.put(f"/api/proposals/{proposal_id}", json={'status': 'rejected'}, headers=owner).status_code == 409
+
+    with app.app_context():
+        project = db.session.get(Project, project_id)
+        assert project.accepted_proposal_id == proposal_id
+        assert db.session.get(Proposal, proposal_id).status == 'accepted'
@@ -0,0 +1,15 @@
+import atexit
+import threading
+
+def test_rebuilding_the_app_does_not_pile_up_listeners_or_exit_hooks(app, monkeypatch):
+    from app import create_app
+
+    registered = []
+    monkeypatch.setattr(atexit, 'register', registered.append)
+    create_app({'TESTING': True})
+    threads = threading.active_count()
+    for _ in range(3):
+        create_app({'TESTING': True})
+
+    assert threading.active_count() == threads
+    assert registered == []
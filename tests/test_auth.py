@@ -0,0 +1,42 @@
+import time
+
+from flask_jwt_extended import create_access_token
+
+from auth import RevocationCache, check_token_revoked, revoked_users
+from extensions import db
+from models import User
+from serializers import USER
+
+def test_role_change_revokes_earlier_tokens_only(app, client, make_user):
+    user_id, headers = make_user('client')
+    assert client.get('/api/auth/me', headers=headers).status_code == 200
+
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.role = 'freelancer'
+        db.session.commit()
+        # Issued within the same second as the revocation, but after it
+        fresh = create_access_token(identity=USER.dump(user, 'identity'))
+
+    assert client.get('/api/auth/me', headers=headers).status_code == 401
+    assert client.get('/api/auth/me', headers={'Authorization': f"Bearer {fresh}"}).status_code == 200
+
+def test_tokens_with_only_whole_second_iat_compare_by_second(make_user):
+    user_id, _ = make_user('client')
+    revoked_users.revoke(user_id)
+    revoked_second = int(revoked_users.revoked_at(user_id))
+
+    assert check_token_revoked({}, {'sub': {'id': user_id}, 'iat': revoked_second})
+    assert not check_token_revoked({}, {'sub': {'id': user_id}, 'iat': revoked_second + 1})
+
+def test_cache_keeps_live_entries_and_drops_expired_ones():
+    cache = RevocationCache(ttl=60)
+    for user_id in range(1000):
+        cache.revoke(user_id)
+    assert all(cache.revoked_at(user_id) is not None for user_id in range(1000))
+
+    cache._entries[0] = time.time() - 120
+    cache._entries.move_to_end(0, last=False)
+    cache.revoke(1000)
+    assert cache.revoked_at(0) is None
+    assert len(cache._entries) == 1000
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from batch_writer import BatchWriter
+
+def test_concurrent_submits_are_grouped_and_answered_in_order():
+    batches = []
+    release = threading.Event()
+
+    def flush(items):
+        release.wait(5)
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    writer = BatchWriter(flush, batch_size=50, max_latency=0.05)
+    try:
+        futures = [writer.submit(i) for i in range(20)]
+        release.set()
+        assert [f.result(5) for f in futures] == [i * 10 for i in range(20)]
+    finally:
+        writer.close()
+    # The first item may flush alone while the rest queue up behind it
+    assert len(batches) <= 2
+    assert [item for batch in batches for item in batch] == list(range(20))
+
+def test_batches_never_exceed_the_batch_size():
+    batches = []
+    writer = BatchWriter(lambda items: batches.append(len(items)) or list(items), batch_size=4, max_latency=0.05)
+    try:
+        futures = [writer.submit(i) for i in range(10)]
+        [f.result(5) for f in futures]
+    finally:
+        writer.close()
+    assert sum(batches) == 10 and max(batches) <= 4
+
+def test_a_bad_item_fails_alone():
+    def flush(items):
+        if 'bad' in items:
+            raise ValueError('bad item')
+        return [item.upper() for item in items]
+
+    writer = BatchWriter(flush, batch_size=10, max_latency=0.05)
+    try:
+        futures = [writer.submit(item) for item in ('a', 'bad', 'c')]
+        assert futures[0].result(5) == 'A'
+        with pytest.raises(ValueError):
+            futures[1].result(5)
+        assert futures[2].result(5) == 'C'
+    finally:
+        writer.close()
+    assert writer.stats()['errors'] == 1
+
+def test_close_flushes_queued_items_and_refuses_new_ones():
+    written = []
+    writer = BatchWriter(lambda items: written.extend(items) or list(items), batch_size=100, max_latency=10)
+    futures = [writer.submit(i) for i in range(5)]
+    writer.close()
+    assert written == list(range(5)) and all(f.done() for f in futures)
+    with pytest.raises(RuntimeError):
+        writer.submit(5)
+
+def test_sent_messages_are_stored_through_the_writer(client, make_user):
+    receiver_id, receiver = make_user('client')
+    sender_id, sender = make_user('freelancer')
+    sent = [client.post('/api/messages', json={'receiver_id': receiver_id, 'content': f"m{i}"}, headers=sender)
+            for i in range(3)]
+    assert [r.status_code for r in sent] == [201] * 3
+
+    history = client.get('/api/messages', query_string={'userId': sender_id}, headers=receiver).get_json()
+    assert [m['content'] for m in history][-3:] == ['m0', 'm1', 'm2']
@@ -0,0 +1,61 @@
+import pytest
+
+@pytest.fixture
+def project(client, make_user):
+    _, owner = make_user('client')
+    _, freelancer = make_user('freelancer')
+    project_id = client.post('/api/projects', json={
+        'title': 'Conditional', 'description': 'conditional', 'budget': 100
+    }, headers=owner).get_json()['project_id']
+    proposal_id = client.post('/api/proposals', json={
+        'project_id': project_id, 'cover_letter': 'me', 'bid_amount': 50
+    }, headers=freelancer).get_json()['proposal_id']
+    return {'id': project_id, 'owner': owner, 'freelancer': freelancer, 'proposal_id': proposal_id}
+
+def _revalidate(client, url, headers, etag):
+    return client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+
+def test_unchanged_project_answers_304_until_it_changes(client, project):
+    url = f"/api/projects/{project['id']}"
+    first = client.get(url, headers=project['owner'])
+    etag = first.headers['ETag']
+    assert first.status_code == 200 and first.headers['Last-Modified']
+
+    assert _revalidate(client, url, project['owner'], etag).status_code == 304
+    since = client.get(url, headers=dict(project['owner'], **{'If-Modified-Since': first.headers['Last-Modified']}))
+    assert since.status_code == 304
+
+    client.put(f"/api/proposals/{project['proposal_id']}", json={'status': 'accepted'}, headers=project['owner'])
+    changed = _revalidate(client, url, project['owner'], etag)
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['status'] == 'in_progress'
+
+def test_proposal_collection_etag_follows_its_proposals(client, make_user, project):
+    url = f"/api/projects/{project['id']}/proposals"
+    etag = client.get(url, headers=project['owner']).headers['ETag']
+    assert _revalidate(client, url, project['owner'], etag).status_code == 304
+
+    _, other = make_user('freelancer')
+    client.post('/api/proposals', json={'project_id': project['id'], 'cover_letter': 'me too', 'bid_amount': 40},
+                headers=other)
+    after_new = _revalidate(client, url, project['owner'], etag)
+    assert after_new.status_code == 200 and len(after_new.get_json()) == 2
+
+    etag = after_new.headers['ETag']
+    client.put(f"/api/proposals/{project['proposal_id']}", json={'status': 'rejected'}, headers=project['owner'])
+    assert _revalidate(client, url, project['owner'], etag).status_code == 200
+
+def test_freelancer_proposals_etag_changes_when_one_is_decided(client, project):
+    url = '/api/proposals/accepted'
+    etag = client.get(url, headers=project['freelancer']).headers['ETag']
+    assert _revalidate(client, url, project['freelancer'], etag).status_code == 304
+
+    client.put(f"/api/proposals/{project['proposal_id']}", json={'status': 'accepted'}, headers=project['owner'])
+    assert _revalidate(client, url, project['freelancer'], etag).status_code == 200
+
+def test_a_matching_etag_does_not_bypass_access_checks(client, make_user, project):
+    url = f"/api/projects/{project['id']}/proposals"
+    etag = client.get(url, headers=project['owner']).headers['ETag']
+    _, stranger = make_user('client')
+    assert _revalidate(client, url, stranger, etag).status_code == 403
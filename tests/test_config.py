@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+import config
+from extensions import db
+
+def test_sqlite_connections_get_the_configured_pragmas(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert conn.execute(text('PRAGMA journal_mode')).scalar().lower() == 'wal'
+            # NORMAL
+            assert conn.execute(text('PRAGMA synchronous')).scalar() == 1
+            assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+
+def test_pragmas_follow_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv('SQLITE_SYNCHRONOUS', 'FULL')
+    monkeypatch.setenv('SQLITE_BUSY_TIMEOUT_MS', '1234')
+    engine = create_engine(f"sqlite:///{tmp_path}/env.db", **config.engine_options(f"sqlite:///{tmp_path}/env.db"))
+    config.configure_engine(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 2
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 1234
+    engine.dispose()
+
+def test_in_memory_sqlite_is_left_alone():
+    engine = create_engine('sqlite://')
+    config.configure_engine(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text('PRAGMA journal_mode')).scalar().lower() == 'memory'
+
+@pytest.mark.parametrize('env, expected', [
+    ({}, {'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 30, 'pool_recycle': 1800, 'pool_pre_ping': True}),
+    ({'DB_POOL_SIZE': '3', 'DB_POOL_PRE_PING': 'false'},
+     {'pool_size': 3, 'max_overflow': 20, 'pool_timeout': 30, 'pool_recycle': 1800, 'pool_pre_ping': False}),
+])
+def test_server_databases_get_pool_options(monkeypatch, env, expected):
+    for name in ('DB_POOL_SIZE', 'DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_POOL_RECYCLE', 'DB_POOL_PRE_PING'):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    assert config.engine_options('postgresql://user:secret@db/talentlink') == expected
+
+def test_engine_report_hides_the_password():
+    pytest.importorskip('psycopg2')
+    engine = create_engine('postgresql://user:secret@db/talentlink', **config.engine_options('postgresql://db/x'))
+    report = config.engine_report(engine)
+    assert 'secret' not in report
+    assert 'size=10' in report and 'pre_ping=True' in report
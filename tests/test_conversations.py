@@ -0,0 +1,67 @@
+import pytest
+
+import migrations
+from extensions import db
+from messages import _update_conversations
+from models import Message
+
+@pytest.fixture
+def pair(make_user):
+    a_id, a = make_user('client')
+    b_id, b = make_user('freelancer')
+    return {'a_id': a_id, 'a': a, 'b_id': b_id, 'b': b}
+
+def _send(client, headers, receiver_id, content):
+    response = client.post('/api/messages', json={'receiver_id': receiver_id, 'content': content}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()
+
+def _inbox(client, headers, other_id):
+    conversations = client.get('/api/messages/conversations', headers=headers).get_json()
+    return next(c for c in conversations if c['user_id'] == other_id)
+
+def test_unread_counts_are_kept_per_participant(client, pair):
+    for content in ('one', 'two'):
+        _send(client, pair['a'], pair['b_id'], content)
+    last = _send(client, pair['b'], pair['a_id'], 'three')
+
+    for_a = _inbox(client, pair['a'], pair['b_id'])
+    for_b = _inbox(client, pair['b'], pair['a_id'])
+    assert (for_a['unread_count'], for_b['unread_count']) == (1, 2)
+    assert for_a['last_message'] == for_b['last_message']
+    assert for_a['last_message']['id'] == last['id']
+    assert for_a['last_message']['content'] == 'three'
+
+def test_reading_a_thread_clears_only_the_readers_count(client, pair):
+    _send(client, pair['a'], pair['b_id'], 'hello')
+    _send(client, pair['b'], pair['a_id'], 'hi')
+
+    client.get('/api/messages', query_string={'userId': pair['a_id']}, headers=pair['b'])
+    assert _inbox(client, pair['b'], pair['a_id'])['unread_count'] == 0
+    assert _inbox(client, pair['a'], pair['b_id'])['unread_count'] == 1
+
+    _send(client, pair['a'], pair['b_id'], 'again')
+    assert _inbox(client, pair['b'], pair['a_id'])['unread_count'] == 1
+
+def test_one_batch_with_several_messages_counts_each(app, client, pair):
+    with app.app_context():
+        messages = [Message(sender_id=pair['a_id'], receiver_id=pair['b_id'], content=f"m{i}") for i in range(3)]
+        db.session.add_all(messages)
+        db.session.flush()
+        _update_conversations(messages)
+        db.session.commit()
+    assert _inbox(client, pair['b'], pair['a_id'])['unread_count'] == 3
+
+def test_rebuild_matches_the_incremental_summaries(app, client, pair):
+    _send(client, pair['a'], pair['b_id'], 'one')
+    _send(client, pair['b'], pair['a_id'], 'two')
+    _send(client, pair['a'], pair['b_id'], 'three')
+    before = [_inbox(client, pair['a'], pair['b_id']), _inbox(client, pair['b'], pair['a_id'])]
+
+    with app.app_context():
+        with db.engine.begin() as conn:
+            migrations.rebuild_conversations(conn)
+    after = [_inbox(client, pair['a'], pair['b_id']), _inbox(client, pair['b'], pair['a_id'])]
+    for summary in before + after:
+        summary.pop('id')
+    assert after == before
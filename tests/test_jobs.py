@@ -0,0 +1,80 @@
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from extensions import db
+from jobs import JobQueue
+from models import Proposal
+
+def _wait_for(queue, outcome, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while queue.stats()[outcome] == 0:
+        assert time.monotonic() < deadline, queue.stats()
+        time.sleep(0.01)
+    return queue.stats()
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(workers=1, max_attempts=3, backoff=0.001, max_backoff=0.01)
+    yield queue
+    queue.close()
+
+def test_failing_task_is_retried_until_it_succeeds(queue):
+    attempts = []
+
+    @queue.task
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError('not yet')
+
+    assert queue.enqueue('flaky')
+    stats = _wait_for(queue, 'completed')
+    assert len(attempts) == 3
+    assert (stats['retried'], stats['failed']) == (2, 0)
+
+def test_task_fails_after_max_attempts(queue):
+    attempts = []
+
+    @queue.task
+    def broken():
+        attempts.append(1)
+        raise RuntimeError('always')
+
+    queue.enqueue('broken')
+    stats = _wait_for(queue, 'failed')
+    assert len(attempts) == queue.max_attempts
+    assert (stats['retried'], stats['completed']) == (queue.max_attempts - 1, 0)
+
+def test_jobs_are_only_enqueued_when_the_transaction_commits(app, queue):
+    ran = []
+
+    @queue.task
+    def record():
+        ran.append(1)
+
+    with app.app_context():
+        # A private session, so the app's job queue keeps its own hooks
+        with Session(db.engine) as session:
+            queue.bind(session)
+            # As after a flush: the hooks only fire for a transaction that began
+            session.connection()
+            queue.enqueue_after_commit(session, 'record')
+            session.rollback()
+            queue.enqueue_after_commit(session, 'record')
+            session.commit()
+    stats = _wait_for(queue, 'completed')
+    assert (ran, stats['enqueued']) == ([1], 1)
+
+def test_new_proposal_notification_skips_a_missing_project(app):
+    from proposals import notify_new_proposal
+
+    with app.app_context():
+        proposal = Proposal(cover_letter='me', bid_amount=50, freelancer_id=1, project_id=999999)
+        db.session.add(proposal)
+        db.session.commit()
+        # Raising would make the job queue retry it
+        notify_new_proposal(proposal.id)
+        db.session.delete(proposal)
+        db.session.commit()
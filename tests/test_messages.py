@@ -0,0 +1,27 @@
+import pytest
+
+@pytest.mark.parametrize('project_id, error', [
+    ('zzz', 'A valid project_id is required'),
+    (999999, 'Project not found'),
+])
+def test_message_project_must_exist(client, make_user, project_id, error):
+    receiver_id, _ = make_user('client')
+    _, sender = make_user('freelancer')
+    response = client.post('/api/messages', json={
+        'receiver_id': receiver_id, 'content': 'hello', 'project_id': project_id
+    }, headers=sender)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': error}
+
+def test_message_project_id_is_stored_as_an_integer(client, make_user):
+    receiver_id, owner = make_user('client')
+    _, sender = make_user('freelancer')
+    project_id = client.post('/api/projects', json={
+        'title': 'Chat', 'description': 'chat', 'budget': 100
+    }, headers=owner).get_json()['project_id']
+
+    response = client.post('/api/messages', json={
+        'receiver_id': receiver_id, 'content': 'hello', 'project_id': str(project_id)
+    }, headers=sender)
+    assert response.status_code == 201
+    assert response.get_json()['project_id'] == project_id
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import Project
+
+@pytest.fixture
+def category(app, make_user):
+    """A category of its own holding six projects, three sharing one created_at."""
+    owner_id, owner = make_user('client')
+    name = f"pagination-{owner_id}"
+    tied = datetime(2024, 1, 1)
+    with app.app_context():
+        for i in range(6):
+            db.session.add(Project(title=f"Page {i}", description='paged', category=name, budget=10 * (i + 1),
+                                   client_id=owner_id, created_at=tied if i < 3 else datetime(2024, 1, 2, i)))
+        db.session.commit()
+    return name, owner
+
+def _pages(client, headers, **params):
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        response = client.get('/api/projects', query_string=query, headers=headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        pages.append(body['items'])
+        cursor = body['next_cursor']
+        if not cursor:
+            return pages
+
+def test_cursor_pages_newest_first_without_gaps_or_repeats(app, client, category):
+    name, owner = category
+    pages = _pages(client, owner, category=name, limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2]
+
+    ids = [item['id'] for page in pages for item in page]
+    with app.app_context():
+        expected = [p.id for p in Project.query.filter_by(category=name).order_by(
+            Project.created_at.desc(), Project.id.desc())]
+    assert ids == expected
+
+def test_filters_apply_to_every_page(client, category):
+    name, owner = category
+    pages = _pages(client, owner, category=name, min_budget=20, max_budget=50, limit=1)
+    assert sorted(item['budget'] for page in pages for item in page) == [20, 30, 40, 50]
+
+def test_summary_view_omits_descriptions(client, category):
+    name, owner = category
+    items = _pages(client, owner, category=name, view='summary')[0]
+    assert items and all('description' not in item for item in items)
+
+def test_plain_list_is_kept_without_paging_parameters(client, category):
+    name, owner = category
+    body = client.get('/api/projects', query_string={'category': name}, headers=owner).get_json()
+    assert isinstance(body, list) and len(body) == 6
+
+@pytest.mark.parametrize('params', [{'limit': 0}, {'limit': 'x'}, {'cursor': 'not-a-cursor'}])
+def test_invalid_paging_parameters_are_rejected(client, category, params):
+    _, owner = category
+    assert client.get('/api/projects', query_string=params, headers=owner).status_code == 400
+
+def test_available_projects_page_without_ones_already_bid_on(client, make_user, category):
+    name, owner = category
+    _, freelancer = make_user('freelancer')
+    first = client.get('/api/projects/available', query_string={'category': name, 'limit': 6},
+                       headers=freelancer).get_json()['items']
+    assert client.post('/api/proposals', json={
+        'project_id': first[0]['id'], 'cover_letter': 'me', 'bid_amount': 5
+    }, headers=freelancer).status_code == 201
+
+    remaining = client.get('/api/projects/available', query_string={'category': name, 'limit': 6},
+                           headers=freelancer).get_json()['items']
+    assert [item['id'] for item in remaining] == [item['id'] for item in first[1:]]
@@ -0,0 +1,26 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from password_hashing import HashingOverloaded, PasswordHasher
+
+@pytest.mark.parametrize('method, stored_method, expected', [
+    ('scrypt', 'scrypt:32768:8:1', False),
+    ('pbkdf2:sha256', 'pbkdf2:sha256:600000', False),
+    ('pbkdf2:sha256:600000', 'pbkdf2:sha256:600000', False),
+    ('pbkdf2:sha256:1000', 'pbkdf2:sha256:600000', True),
+    ('scrypt', 'pbkdf2:sha256:1000', True),
+])
+def test_needs_rehash_compares_normalized_methods(method, stored_method, expected):
+    hasher = PasswordHasher(method=method, workers=1)
+    try:
+        assert hasher.needs_rehash(generate_password_hash('secret', method=stored_method)) is expected
+    finally:
+        hasher.shutdown()
+
+def test_slow_hash_is_reported_as_overloaded():
+    hasher = PasswordHasher(method='pbkdf2:sha256:1000000', workers=1, timeout=0.01)
+    try:
+        with pytest.raises(HashingOverloaded):
+            hasher.hash('secret')
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,54 @@
+import pytest
+
+from extensions import db
+from models import Project
+
+@pytest.fixture
+def open_project(client, make_user):
+    owner_id, owner = make_user('client')
+    project_id = client.post('/api/projects', json={
+        'title': 'Proposals', 'description': 'proposals', 'budget': 100
+    }, headers=owner).get_json()['project_id']
+    return project_id, owner_id
+
+def _propose(client, headers, project_id):
+    return client.post('/api/proposals', json={
+        'project_id': project_id, 'cover_letter': 'me', 'bid_amount': 50
+    }, headers=headers)
+
+def test_proposal_requires_every_field(client, make_user):
+    _, freelancer = make_user('freelancer')
+    response = client.post('/api/proposals', json={'cover_letter': 'me'}, headers=freelancer)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Missing required fields: bid_amount, project_id'}
+
+@pytest.mark.parametrize('project_id, status', [('zzz', 400), (999999, 404)])
+def test_proposal_needs_an_existing_project(client, make_user, project_id, status):
+    _, freelancer = make_user('freelancer')
+    assert _propose(client, freelancer, project_id).status_code == status
+
+def test_proposal_needs_an_open_project(app, client, make_user, open_project):
+    project_id, _ = open_project
+    with app.app_context():
+        db.session.get(Project, project_id).status = 'completed'
+        db.session.commit()
+    _, freelancer = make_user('freelancer')
+    assert _propose(client, freelancer, project_id).status_code == 409
+
+def test_owner_cannot_propose_on_their_own_project(app, client, open_project):
+    from flask_jwt_extended import create_access_token
+
+    project_id, owner_id = open_project
+    with app.app_context():
+        # A client who became a freelancer still owns their projects
+        token = create_access_token(identity={'id': owner_id, 'email': 'owner@test.local', 'role': 'freelancer'})
+    response = _propose(client, {'Authorization': f"Bearer {token}"}, project_id)
+    assert response.status_code == 400
+
+def test_duplicate_proposal_is_rejected(client, make_user, open_project):
+    project_id, _ = open_project
+    _, freelancer = make_user('freelancer')
+    assert _propose(client, freelancer, project_id).status_code == 201
+    response = _propose(client, freelancer, project_id)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'You have already submitted a proposal for this project'}
@@ -0,0 +1,60 @@
+import pytest
+
+from extensions import response_cache
+from helpers import QueryBudgetExceeded
+
+@pytest.fixture
+def marketplace(client, make_user):
+    """Several projects with several proposals each, and a message thread."""
+    owner_id, owner = make_user('client')
+    freelancers = [make_user('freelancer') for _ in range(3)]
+    project_ids = []
+    for i in range(4):
+        project_ids.append(client.post('/api/projects', json={
+            'title': f"Python service {i}", 'description': 'Build a python flask API', 'category': 'web',
+            'budget': 100 + i
+        }, headers=owner).get_json()['project_id'])
+    for project_id in project_ids:
+        for _, headers in freelancers:
+            client.post('/api/proposals', json={
+                'project_id': project_id, 'cover_letter': 'me', 'bid_amount': 50
+            }, headers=headers)
+    freelancer_id, freelancer = freelancers[0]
+    for content in ('hello', 'hi', 'when can you start?'):
+        client.post('/api/messages', json={'receiver_id': owner_id, 'content': content}, headers=freelancer)
+        client.post('/api/messages', json={'receiver_id': freelancer_id, 'content': content}, headers=owner)
+    return {'owner_id': owner_id, 'owner': owner, 'freelancer': freelancer, 'project_id': project_ids[0]}
+
+def _requests(m):
+    return {
+        'projects.get_projects': ('/api/projects?limit=3', m['owner']),
+        'projects.get_my_projects': ('/api/projects/my-projects', m['owner']),
+        'projects.get_available_projects': ('/api/projects/available', m['freelancer']),
+        'projects.get_recommended_projects': ('/api/projects/recommended', m['freelancer']),
+        'projects.search_projects': ('/api/projects/search?q=python', m['freelancer']),
+        'projects.get_project': (f"/api/projects/{m['project_id']}", m['owner']),
+        'proposals.get_accepted_proposals': ('/api/proposals/accepted', m['freelancer']),
+        'proposals.get_project_proposals': (f"/api/projects/{m['project_id']}/proposals", m['owner']),
+        'messages.get_messages': (f"/api/messages?userId={m['owner_id']}", m['freelancer']),
+        'messages.get_conversations': ('/api/messages/conversations', m['freelancer']),
+    }
+
+def test_every_budgeted_route_stays_within_its_budget(app, client, marketplace, monkeypatch):
+    # Cache hits run no SQL; measure the views themselves
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    requests = _requests(marketplace)
+    budgeted = {name for name, view in app.view_functions.items() if hasattr(view, 'query_budget')}
+    assert budgeted == set(requests)
+
+    for endpoint, (url, headers) in requests.items():
+        # SQL_QUERY_BUDGET_ENFORCE raises QueryBudgetExceeded out of the test client
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, (endpoint, response.get_json())
+        count = int(response.headers['X-SQL-Query-Count'])
+        assert count <= app.view_functions[endpoint].query_budget, endpoint
+
+def test_exceeding_a_budget_fails_the_request(app, client, marketplace, monkeypatch):
+    monkeypatch.setattr(response_cache, 'enabled', False)
+    monkeypatch.setattr(app.view_functions['projects.get_my_projects'], 'query_budget', 0)
+    with pytest.raises(QueryBudgetExceeded):
+        client.get('/api/projects/my-projects', headers=marketplace['owner'])
@@ -0,0 +1,20 @@
+import pytest
+
+from extensions import rate_limiter
+from rate_limit import MemoryBackend
+
+@pytest.fixture
+def limited(monkeypatch):
+    monkeypatch.setattr(rate_limiter, 'enabled', True)
+    monkeypatch.setattr(rate_limiter, 'backend', MemoryBackend())
+
+def _login(client, ip):
+    return client.post('/api/auth/login', json={'email': 'victim@test.local', 'password': 'wrong'},
+                       environ_base={'REMOTE_ADDR': ip})
+
+def test_login_attempts_from_one_ip_do_not_lock_the_account_for_others(client, limited):
+    account_limit = dict(rate_limiter.policies['login'])['account_ip'].count
+    for _ in range(account_limit):
+        assert _login(client, '10.0.0.1').status_code == 401
+    assert _login(client, '10.0.0.1').status_code == 429
+    assert _login(client, '10.0.0.2').status_code == 401
@@ -0,0 +1,60 @@
+import json
+import time
+
+import pytest
+
+import projects
+from extensions import db, project_index
+from models import Project
+
+def _wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    project_index.configure(project_index.dim)
+    monkeypatch.setitem(projects._project_index_state, 'synced_at', None)
+    monkeypatch.setitem(projects._project_index_state, 'queued', False)
+
+def _create(client, owner, title):
+    return client.post('/api/projects', json={
+        'title': title, 'description': 'python flask api', 'category': 'web', 'budget': 100
+    }, headers=owner).get_json()['project_id']
+
+def test_index_is_built_in_the_background(client, make_user, fresh_index):
+    _, owner = make_user('client')
+    project_id = _create(client, owner, 'Background build')
+    project_index.configure(project_index.dim)
+    _, freelancer = make_user('freelancer')
+
+    body = client.get('/api/projects/recommended', headers=freelancer).get_json()
+    assert body['indexing'] is True
+    assert project_id in [item['id'] for item in body['items']]
+
+    _wait_until(lambda: projects._project_index_state['synced_at'] is not None)
+    assert project_id in project_index.ids()
+    body = client.get('/api/projects/recommended', headers=freelancer).get_json()
+    assert 'indexing' not in body
+    assert project_id in [item['id'] for item in body['items']]
+
+def test_imported_projects_below_the_synced_id_are_indexed(app, client, make_user, fresh_index):
+    owner_id, owner = make_user('client')
+    _, admin = make_user('admin')
+    _, freelancer = make_user('freelancer')
+    with app.app_context():
+        high = db.session.query(db.func.max(Project.id)).scalar() + 1000
+        db.session.add(Project(id=high, title='High', description='high', budget=10, client_id=owner_id))
+        db.session.commit()
+
+    client.get('/api/projects/recommended', headers=freelancer)
+    _wait_until(lambda: projects._project_index_state['synced_at'] is not None)
+    assert project_index.synced_id == high
+
+    row = {'id': high - 500, 'title': 'Imported', 'description': 'imported', 'budget': 10,
+           'status': 'open', 'client_id': owner_id}
+    assert client.post('/api/admin/import/projects', data=json.dumps(row) + '\n',
+                       headers=admin).status_code == 200
+    _wait_until(lambda: high - 500 in project_index.ids())
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from extensions import response_cache
+from response_cache import MemoryBackend
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(response_cache, 'enabled', True)
+    monkeypatch.setattr(response_cache, 'backend', MemoryBackend())
+
+@pytest.fixture
+def project(client, make_user):
+    owner_id, owner = make_user('client')
+    project_id = client.post('/api/projects', json={
+        'title': 'Cached', 'description': 'cached', 'budget': 100
+    }, headers=owner).get_json()['project_id']
+    return {'id': project_id, 'owner_id': owner_id, 'owner': owner}
+
+def test_cache_is_off_without_a_configured_backend(app, client, project):
+    assert not response_cache.enabled
+    assert 'X-Cache' not in client.get('/api/projects', headers=project['owner']).headers
+
+def _get(client, url, headers):
+    response = client.get(url, headers=headers)
+    return response.headers['X-Cache'], response.get_json()
+
+def test_accepting_a_proposal_invalidates_the_project_views(client, make_user, cache, project):
+    _, freelancer = make_user('freelancer')
+    proposal_id = client.post('/api/proposals', json={
+        'project_id': project['id'], 'cover_letter': 'me', 'bid_amount': 50
+    }, headers=freelancer).get_json()['proposal_id']
+    detail = f"/api/projects/{project['id']}"
+
+    assert _get(client, detail, project['owner'])[0] == 'MISS'
+    assert _get(client, detail, project['owner'])[0] == 'HIT'
+    assert _get(client, '/api/projects/my-projects', project['owner'])[0] == 'MISS'
+
+    assert client.put(f"/api/proposals/{proposal_id}", json={'status': 'accepted'},
+                      headers=project['owner']).status_code == 200
+    state, body = _get(client, detail, project['owner'])
+    assert (state, body['status']) == ('MISS', 'in_progress')
+    assert _get(client, '/api/projects/my-projects', project['owner'])[0] == 'MISS'
+
+def test_import_invalidates_every_cached_view(client, make_user, cache, project):
+    _, admin = make_user('admin')
+    detail = f"/api/projects/{project['id']}"
+    _get(client, detail, project['owner'])
+    _, before = _get(client, '/api/projects/my-projects', project['owner'])
+
+    row = {'id': project['id'] + 10000, 'title': 'Imported', 'description': 'imported', 'budget': 10,
+           'status': 'open', 'client_id': project['owner_id']}
+    response = client.post('/api/admin/import/projects', data=json.dumps(row) + '\n', headers=admin)
+    assert response.status_code == 200, response.get_json()
+
+    assert _get(client, detail, project['owner'])[0] == 'MISS'
+    state, after = _get(client, '/api/projects/my-projects', project['owner'])
+    assert state == 'MISS'
+    assert after != before
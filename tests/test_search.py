@@ -0,0 +1,53 @@
+import pytest
+
+from extensions import db
+
+@pytest.fixture
+def owner(make_user):
+    return make_user('client')[1]
+
+def _create(client, owner, title, description='plain', category='misc'):
+    return client.post('/api/projects', json={
+        'title': title, 'description': description, 'category': category, 'budget': 100
+    }, headers=owner).get_json()['project_id']
+
+def _search(client, headers, **params):
+    response = client.get('/api/projects/search', query_string=params, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+def test_title_matches_rank_above_description_matches(client, owner):
+    in_description = _create(client, owner, 'Plain job', description='needs a quokkafarm expert')
+    in_title = _create(client, owner, 'Quokkafarm site')
+    ids = [item['id'] for item in _search(client, owner, q='quokkafarm')['items']]
+    assert ids == [in_title, in_description]
+
+def test_cursor_pages_through_every_match_once(client, owner):
+    created = {_create(client, owner, f"Wombatwork {i}") for i in range(5)}
+    seen, cursor = [], None
+    while True:
+        params = {'q': 'wombatwork', 'limit': 2}
+        if cursor:
+            params['cursor'] = cursor
+        page = _search(client, owner, **params)
+        seen += [item['id'] for item in page['items']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(created)
+
+def test_last_term_matches_as_a_prefix(client, owner):
+    project_id = _create(client, owner, 'Numbatnest redesign')
+    assert [item['id'] for item in _search(client, owner, q='numbatn')['items']] == [project_id]
+
+def test_fallback_search_matches_like_wildcards_literally(app, client, owner, monkeypatch):
+    percent = _create(client, owner, 'Bilby 100% coverage')
+    _create(client, owner, 'Bilby 1000 tests')
+    underscore = _create(client, owner, 'Bilby snake_case')
+    _create(client, owner, 'Bilby snakeXcase')
+
+    with app.app_context():
+        # Exercise the LIKE path used by databases without FTS5
+        monkeypatch.setattr(db.engine.dialect, 'name', 'postgresql')
+    assert [item['id'] for item in _search(client, owner, q='bilby 100%')['items']] == [percent]
+    assert [item['id'] for item in _search(client, owner, q='bilby snake_case')['items']] == [underscore]
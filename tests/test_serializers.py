@@ -0,0 +1,51 @@
+import gzip
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from serializers import OrjsonProvider, Serializer, StdlibJSONProvider, orjson
+
+def _project(**fields):
+    defaults = dict(id=1, title='T', budget=5.0, owner=SimpleNamespace(name='Ada'))
+    return SimpleNamespace(**dict(defaults, **fields))
+
+def test_views_pick_fields_follow_paths_and_omit():
+    serializer = Serializer(
+        short=('id',),
+        full=('id', 'title', 'client_name=owner.name', ('double', lambda p: p.budget * 2)),
+    )
+    project = _project()
+    assert serializer.dump(project, 'short') == {'id': 1}
+    assert serializer.dump(project, 'full') == {'id': 1, 'title': 'T', 'client_name': 'Ada', 'double': 10.0}
+    assert serializer.dump(project, 'full', omit=('title', 'double')) == {'id': 1, 'client_name': 'Ada'}
+    assert serializer.dump_many([project, _project(id=2)], 'short') == [{'id': 1}, {'id': 2}]
+
+@pytest.mark.parametrize('provider', [
+    StdlibJSONProvider,
+    pytest.param(OrjsonProvider, marks=pytest.mark.skipif(orjson is None, reason='orjson not installed')),
+])
+def test_providers_agree_on_datetimes(provider):
+    app = Flask(__name__)
+    app.json = provider(app)
+    value = {'at': datetime(2024, 1, 2, 3, 4, 5, 6), 'n': [1, 2.5, None]}
+    assert json.loads(app.json.dumps(value)) == {'at': '2024-01-02T03:04:05.000006', 'n': [1, 2.5, None]}
+    with app.app_context():
+        response = app.json.response(value)
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == json.loads(app.json.dumps(value))
+
+def test_api_responses_round_trip_and_compress(client, make_user):
+    _, owner = make_user('client')
+    for i in range(15):
+        client.post('/api/projects', json={
+            'title': f"Serialized {i}", 'description': 'x' * 100, 'budget': 10
+        }, headers=owner)
+
+    plain = client.get('/api/projects/my-projects', headers=owner)
+    compressed = client.get('/api/projects/my-projects', headers=dict(owner, **{'Accept-Encoding': 'gzip'}))
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(compressed.get_data())) == plain.get_json()
+    assert all(datetime.fromisoformat(p['created_at']) for p in plain.get_json())
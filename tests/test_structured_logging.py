@@ -0,0 +1,18 @@
+import io
+import json
+
+import structured_logging
+
+def test_exceptions_are_logged_in_their_own_field():
+    stream = io.StringIO()
+    logger, _, _ = structured_logging.configure('talentlink.test', stream=stream)
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logger.exception('failed for %s', 'user 7', extra={'fields': {'password': 'hunter2'}})
+    structured_logging.shutdown('talentlink.test')
+
+    entry = json.loads(stream.getvalue())
+    assert entry['msg'] == 'failed for user 7'
+    assert entry['exc'].startswith('Traceback') and 'ValueError: boom' in entry['exc']
+    assert entry['password'] == structured_logging.REDACTED